@@ -10,7 +10,7 @@ from fastapi import UploadFile
 from lotgenius.api.schemas import ReportRequest, ReportResponse
 from lotgenius.cli.report_lot import _mk_markdown, _optional_html, _optional_pdf
 from lotgenius.config import settings
-from lotgenius.ids import extract_ids
+from lotgenius.ids import extract_ids_frame
 from lotgenius.roi import optimize_bid
 
 
@@ -211,13 +211,11 @@ def run_optimize(
     core_items = []
     upside_items = []
 
-    for idx, row in items_df.iterrows():
+    # Use ID helper for consistent canonical handling, one pass for all rows
+    high_trust_ids = extract_ids_frame(items_df).notna().any(axis=1).tolist()
+
+    for (idx, row), has_high_trust_id in zip(items_df.iterrows(), high_trust_ids):
         item = dict(row)
-        # Use ID helper for consistent canonical handling
-        ids = extract_ids(item)
-        has_high_trust_id = bool(
-            ids["asin"] or ids["upc"] or ids["ean"] or ids["upc_ean_asin"]
-        )
         sold_comps_180d = int(
             (item.get("keepa_new_count") or 0) + (item.get("keepa_used_count") or 0)
         )
@@ -463,11 +461,9 @@ def run_pipeline(
     core_items: List[Dict[str, Any]] = []
     review_items: List[Dict[str, Any]] = []
 
-    def _has_high_trust_id(it: Dict[str, Any]) -> bool:
-        ids = extract_ids(it)
-        return bool(ids["asin"] or ids["upc"] or ids["ean"] or ids["upc_ean_asin"])
+    high_trust_ids = extract_ids_frame(items_df).notna().any(axis=1).tolist()
 
-    for idx, row in items_df.iterrows():
+    for (idx, row), has_high_trust_id in zip(items_df.iterrows(), high_trust_ids):
         item = dict(row)
         keepa_blob = item.get("keepa") or {}
         comps = item.get("sold_comps") or []
@@ -509,7 +505,7 @@ def run_pipeline(
 
         ev = compute_evidence(
             item_key=str(item_key),
-            has_high_trust_id=_has_high_trust_id(item),
+            has_high_trust_id=has_high_trust_id,
             sold_comps=comps,
             secondary_signals=sec,
             sources={"keepa": bool(keepa_blob), "comps": len(comps)},
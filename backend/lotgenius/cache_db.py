@@ -0,0 +1,82 @@
+"""
+Per-thread SQLite connections for the on-disk caches.
+
+Each cache module owns one ThreadLocalConnections and passes it its schema
+setup; connections are reused per thread and closed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+# Per-connection settings: WAL makes NORMAL sync safe and avoids an
+# fsync on every cache write
+_BASE_PRAGMAS = (
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+)
+
+
+class ThreadLocalConnections:
+    """
+    One connection per thread, reused while the database path stays the same.
+
+    Every new connection runs the cache's schema setup, which must be
+    idempotent (CREATE ... IF NOT EXISTS). That costs one round of DDL per
+    thread and means a cache file deleted while the process runs is simply
+    recreated by the next connection.
+    """
+
+    def __init__(
+        self,
+        init_schema: Callable[[sqlite3.Connection], None],
+        pragmas: Sequence[str] = (),
+    ):
+        self._init_schema = init_schema
+        self._pragmas = (*_BASE_PRAGMAS, *pragmas)
+        self._tls = threading.local()
+        self._open: List[sqlite3.Connection] = []
+        self._open_lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def get(self, path: Path | str) -> sqlite3.Connection:
+        """Return this thread's connection to path, reopening if path changed."""
+        db_key = str(path)
+        conn = getattr(self._tls, "conn", None)
+        if conn is not None:
+            if self._tls.db_key == db_key:
+                return conn
+            with self._open_lock:
+                if conn in self._open:
+                    self._open.remove(conn)
+            conn.close()
+
+        conn = self.connect(path)
+        self._tls.conn = conn
+        self._tls.db_key = db_key
+        with self._open_lock:
+            self._open.append(conn)
+        return conn
+
+    def connect(self, path: Path | str) -> sqlite3.Connection:
+        """Open and configure a new connection, creating the schema if needed."""
+        conn = sqlite3.connect(path, check_same_thread=False)
+        for pragma in self._pragmas:
+            conn.execute(pragma)
+        # journal_mode=WAL persists in the file; setting it again is a no-op
+        conn.execute("PRAGMA journal_mode=WAL;")
+        self._init_schema(conn)
+        return conn
+
+    def close_all(self) -> None:
+        """Close every connection and make all threads reconnect on next use."""
+        self._tls = threading.local()
+        with self._open_lock:
+            conns, self._open = self._open, []
+        for conn in conns:
+            conn.close()
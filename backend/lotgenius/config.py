@@ -92,6 +92,10 @@ class Settings(BaseSettings):
     EXTERNAL_COMPS_CACHE_TTL_DAYS: int = Field(
         7, description="Cache TTL for external comps in days"
     )
+    EXTERNAL_COMPS_CACHE_IN_MEMORY: bool = Field(
+        False,
+        description="Serve the external comps cache from memory; saved to disk at exit",
+    )
 
     # Tail-risk alpha for VaR/CVaR (0.20 => 80% VaR)
     VAR_ALPHA: float = Field(
@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Protocol
 
 
-@dataclass
+# slots: comps are created per parsed listing row, so keep instances lean
+@dataclass(slots=True)
 class SoldComp:
     source: str
     title: str
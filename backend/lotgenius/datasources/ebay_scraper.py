@@ -1,20 +1,30 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import os
 import random
+import re
 import sqlite3
-import statistics
 import threading
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import requests
+import soupsieve
 from bs4 import BeautifulSoup
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
 
 from ..cache_metrics import (
     get_cache_stats,
@@ -51,6 +61,16 @@ def _ebay_cache_db():
     )"""
     )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_ebay_cache_ts ON ebay_cache(ts);")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS ebay_scrape_cache (
+        fingerprint TEXT PRIMARY KEY,
+        results TEXT NOT NULL,
+        ts INTEGER NOT NULL
+    )"""
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ebay_scrape_cache_ts ON ebay_scrape_cache(ts);"
+    )
     return conn
 
 
@@ -107,25 +127,7 @@ def _get_cached_ebay_results(
 
     record_cache_hit("ebay")
     try:
-        results_data = json.loads(results_json)
-        return [
-            SoldComp(
-                source=comp.get("source", "ebay"),
-                title=comp.get("title", ""),
-                price=comp.get("price"),
-                condition=comp.get("condition", "Unknown"),
-                sold_at=(
-                    datetime.fromisoformat(comp["sold_at"])
-                    if comp.get("sold_at")
-                    else None
-                ),
-                url=comp.get("url"),
-                id=comp.get("id"),
-                match_score=comp.get("match_score", 0.0),
-                meta=comp.get("meta", {}),
-            )
-            for comp in results_data
-        ]
+        return _records_to_comps(json.loads(results_json))
     except Exception:
         record_cache_miss("ebay")
         return None
@@ -133,20 +135,7 @@ def _get_cached_ebay_results(
 
 def _cache_ebay_results(fingerprint: str, comps: List[SoldComp]) -> None:
     """Cache eBay results by fingerprint."""
-    cache_data = [
-        {
-            "source": comp.source,
-            "title": comp.title,
-            "price": comp.price,
-            "condition": comp.condition,
-            "sold_at": comp.sold_at.isoformat() if comp.sold_at else None,
-            "url": comp.url,
-            "id": comp.id,
-            "match_score": comp.match_score,
-            "meta": comp.meta,
-        }
-        for comp in comps
-    ]
+    cache_data = _comps_to_records(comps)
 
     with _ebay_cache_lock:
         conn = _ebay_cache_db()
@@ -168,6 +157,7 @@ def _cleanup_expired_ebay_entries(ttl_sec: int) -> None:
             cutoff_time = int(time.time()) - ttl_sec
             cursor = conn.execute("DELETE FROM ebay_cache WHERE ts < ?", (cutoff_time,))
             cursor.rowcount  # We don't need the count, but ruff wants us to acknowledge it
+            conn.execute("DELETE FROM ebay_scrape_cache WHERE ts < ?", (cutoff_time,))
             conn.commit()
             conn.close()
             # Note: We don't record evictions here since they weren't requested entries
@@ -175,6 +165,94 @@ def _cleanup_expired_ebay_entries(ttl_sec: int) -> None:
         pass  # Ignore cleanup errors
 
 
+def _comps_to_records(comps: List[SoldComp]) -> List[Dict]:
+    """Serialize SoldComp objects to JSON-safe dicts for caching."""
+    return [
+        {
+            "source": comp.source,
+            "title": comp.title,
+            "price": comp.price,
+            "condition": comp.condition,
+            "sold_at": comp.sold_at.isoformat() if comp.sold_at else None,
+            "url": comp.url,
+            "id": comp.id,
+            "match_score": comp.match_score,
+            "meta": comp.meta,
+        }
+        for comp in comps
+    ]
+
+
+def _records_to_comps(records: List[Dict]) -> List[SoldComp]:
+    """Rebuild SoldComp objects from cached dicts."""
+    return [
+        SoldComp(
+            source=comp.get("source", "ebay"),
+            title=comp.get("title", ""),
+            price=comp.get("price"),
+            condition=comp.get("condition", "Unknown"),
+            sold_at=(
+                datetime.fromisoformat(comp["sold_at"]) if comp.get("sold_at") else None
+            ),
+            url=comp.get("url"),
+            id=comp.get("id"),
+            match_score=comp.get("match_score", 0.0),
+            meta=comp.get("meta", {}),
+        )
+        for comp in records
+    ]
+
+
+def _generate_scrape_fingerprint(
+    targeted_query: str,
+    condition_hint: Optional[str],
+    max_results: int,
+    days_lookback: int,
+) -> str:
+    """Fingerprint for a raw (pre-filter) scrape of one targeted eBay query."""
+    condition = (condition_hint or "").strip().lower()
+    key = f"{targeted_query}|{condition}|{max_results}|{days_lookback}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_scrape(fingerprint: str, ttl_sec: int) -> Optional[List[SoldComp]]:
+    """
+    Get raw scraped comps for a targeted query, before similarity filtering.
+
+    Different titles that resolve to the same targeted query (e.g. the same
+    UPC) share one network fetch; filtering is still applied per call.
+    """
+    with _ebay_cache_lock:
+        conn = _ebay_cache_db()
+        row = conn.execute(
+            "SELECT results, ts FROM ebay_scrape_cache WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        conn.close()
+
+    if not row:
+        return None
+    if int(time.time()) - row[1] > ttl_sec:
+        _cleanup_expired_ebay_entries(ttl_sec)
+        return None
+    try:
+        return _records_to_comps(json.loads(row[0]))
+    except Exception:
+        return None
+
+
+def _cache_scrape(fingerprint: str, comps: List[SoldComp]) -> None:
+    """Store raw scraped comps for a targeted query."""
+    with _ebay_cache_lock:
+        conn = _ebay_cache_db()
+        conn.execute(
+            "INSERT OR REPLACE INTO ebay_scrape_cache (fingerprint, results, ts) VALUES (?, ?, ?)",
+            (fingerprint, json.dumps(_comps_to_records(comps)), int(time.time())),
+        )
+        conn.commit()
+        conn.close()
+
+
 def _guard_enabled() -> None:
     if not settings.SCRAPER_TOS_ACK:
         raise RuntimeError(
@@ -220,6 +298,47 @@ def _parse_price(text: str) -> Optional[float]:
         return None
 
 
+# Listing phrases that mark a comp as not representative of a working unit
+_CONDITION_PROBLEM_RE = re.compile(r"for parts|not working|broken|repair[- ]only")
+
+
+# Generic listing words stripped from titles before querying/matching
+_GENERIC_TERMS = frozenset(
+    {
+        "bundle",
+        "lot",
+        "assorted",
+        "various",
+        "pack",
+        "generic",
+        "case",
+        "piece",
+        "damaged",
+        "broken",
+        "repair",
+        "for",
+        "parts",
+        "wholesale",
+        "of",
+        "and",
+        "the",
+        "a",
+        "an",
+        "with",
+    }
+)
+
+
+def _strip_generic_terms(title: str) -> List[str]:
+    """Lowercased title words minus generic terms (numbers always kept)."""
+    return [
+        w
+        for w in title.lower().split()
+        if w.isdigit() or (w not in _GENERIC_TERMS and len(w) > 2)
+    ]
+
+
+@functools.lru_cache(maxsize=4096)
 def _build_targeted_query(
     query: str,
     brand: Optional[str],
@@ -245,37 +364,7 @@ def _build_targeted_query(
         return f'"{brand}" "{model}"'
 
     # Priority 3: Filtered title fallback
-    # Strip generic terms (be more specific about whole word matches)
-    generic_terms = {
-        "bundle",
-        "lot",
-        "assorted",
-        "various",
-        "pack",
-        "generic",
-        "case",
-        "piece",
-        "damaged",
-        "broken",
-        "repair",
-        "for",
-        "parts",
-        "wholesale",
-        "of",
-        "and",
-        "the",
-        "a",
-        "an",
-        "with",
-    }
-
-    # Normalize and clean the query
-    words = query.lower().split()
-    # Keep numbers and meaningful words
-    filtered_words = []
-    for w in words:
-        if w.isdigit() or (w not in generic_terms and len(w) > 2):
-            filtered_words.append(w)
+    filtered_words = _strip_generic_terms(query)
 
     if filtered_words:
         filtered_query = " ".join(filtered_words)
@@ -296,6 +385,23 @@ def _title_similarity(a: str, b: str) -> float:
     return fuzz.token_set_ratio(a, b) / 100.0
 
 
+def _title_similarities(titles: List[str], target: str) -> np.ndarray:
+    """
+    Batch form of _title_similarity: score each title against target.
+    Returns an array of scores between 0.0 and 1.0.
+    """
+    if not titles:
+        return np.empty(0, dtype=np.float64)
+    scores = process.cdist(
+        [target],
+        titles,
+        scorer=fuzz.token_set_ratio,
+        dtype=np.float64,
+        workers=-1,
+    )
+    return scores[0] / 100.0
+
+
 def _filter_results(
     results: List[SoldComp],
     target_title: str,
@@ -317,119 +423,255 @@ def _filter_results(
         target_string = f"{brand} {model}"
     else:
         # Use filtered target_title (same generic-term removal as query builder)
-        generic_terms = {
-            "bundle",
-            "lot",
-            "assorted",
-            "various",
-            "pack",
-            "generic",
-            "case",
-            "piece",
-            "damaged",
-            "broken",
-            "repair",
-            "for",
-            "parts",
-            "wholesale",
-            "of",
-            "and",
-            "the",
-            "a",
-            "an",
-            "with",
-        }
-        words = target_title.lower().split()
-        # Keep numbers and meaningful words
-        filtered_words = []
-        for w in words:
-            if w.isdigit() or (w not in generic_terms and len(w) > 2):
-                filtered_words.append(w)
+        filtered_words = _strip_generic_terms(target_title)
         target_string = " ".join(filtered_words) if filtered_words else target_title
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days_lookback)
-    filtered = []
-
-    for comp in results:
-        # Recency filter (already done in original code, but double-check)
-        if comp.sold_at and comp.sold_at < cutoff:
-            diagnostics["recency"] += 1
-            continue
-
-        # Similarity filter
-        similarity = _title_similarity(comp.title, target_string)
-        if similarity < similarity_min:
-            diagnostics["similarity"] += 1
-            continue
+    # One clock read per call, shared by the recency filter and quality scores.
+    # Work in integer epoch seconds so the per-comp checks avoid timedeltas.
+    now_ts = int(datetime.now(timezone.utc).timestamp())
+    cutoff_ts = now_ts - days_lookback * 86400
+
+    n = len(results)
+    titles_lower = [comp.title.lower() for comp in results]
+    # Unknown sale dates are NaN: they never fail the recency check
+    sold_ts = np.fromiter(
+        (int(comp.sold_at.timestamp()) if comp.sold_at else np.nan for comp in results),
+        dtype=np.float64,
+        count=n,
+    )
 
-        # Model presence check - if model is specified, require it in title
-        if model and model.lower() not in comp.title.lower():
-            diagnostics["similarity"] += 1  # Count as similarity issue
-            continue
+    # Independent cheap predicates, one boolean mask each
+    recency_ok = ~(sold_ts < cutoff_ts)
 
-        # Condition problem filter - avoid "for parts" items unless explicitly wanted
-        if condition_hint and condition_hint.lower() not in ["salvage", "for parts"]:
-            problem_terms = [
-                "for parts",
-                "not working",
-                "broken",
-                "repair-only",
-                "repair only",
-            ]
-            title_lower = comp.title.lower()
-            if any(term in title_lower for term in problem_terms):
-                diagnostics["condition"] += 1
-                continue
+    # Condition problem filter - avoid "for parts" items unless explicitly wanted
+    check_condition = bool(condition_hint) and condition_hint.lower() not in [
+        "salvage",
+        "for parts",
+    ]
+    if check_condition:
+        condition_ok = np.fromiter(
+            (_CONDITION_PROBLEM_RE.search(t) is None for t in titles_lower),
+            dtype=bool,
+            count=n,
+        )
+    else:
+        condition_ok = np.ones(n, dtype=bool)
 
+    # Model presence check - if model is specified, require it in title
+    if model:
+        model_lower = model.lower()
+        model_ok = np.fromiter(
+            (model_lower in t for t in titles_lower), dtype=bool, count=n
+        )
+    else:
+        model_ok = np.ones(n, dtype=bool)
+
+    # Diagnostics attribute each rejected comp to the first failing check,
+    # in the order recency, condition, model presence (counted as similarity)
+    diagnostics["recency"] += int(np.count_nonzero(~recency_ok))
+    passed = recency_ok & condition_ok
+    diagnostics["condition"] += int(np.count_nonzero(recency_ok & ~condition_ok))
+    diagnostics["similarity"] += int(np.count_nonzero(passed & ~model_ok))
+    passed &= model_ok
+
+    # Similarity filter: fuzzy scoring only runs on comps that can still be kept
+    keep_idx = np.flatnonzero(passed)
+    similarities = _title_similarities(
+        [results[i].title for i in keep_idx], target_string
+    )
+    similarity_ok = similarities >= similarity_min
+    diagnostics["similarity"] += int(np.count_nonzero(~similarity_ok))
+    keep_idx = keep_idx[similarity_ok]
+    similarities = similarities[similarity_ok]
+
+    filtered = [results[i] for i in keep_idx]
+    filtered_ts = sold_ts[keep_idx]
+    for comp, similarity in zip(filtered, similarities):
         # Add similarity score to comp metadata
         comp.meta = comp.meta or {}
-        comp.meta["similarity"] = similarity
-
-        filtered.append(comp)
+        comp.meta["similarity"] = float(similarity)
 
     # Price outlier detection (only if we have enough samples)
     if len(filtered) >= 5:
-        prices = [comp.price for comp in filtered if comp.price is not None]
-        if len(prices) >= 5:
-            median_price = statistics.median(prices)
+        prices = np.fromiter(
+            (np.nan if comp.price is None else comp.price for comp in filtered),
+            dtype=np.float64,
+            count=len(filtered),
+        )
+        known = ~np.isnan(prices)
+        if np.count_nonzero(known) >= 5:
+            median_price = np.median(prices[known])
             # Use MAD (Median Absolute Deviation) for outlier detection
-            mad = statistics.median([abs(p - median_price) for p in prices])
+            deviations = np.abs(prices - median_price)
+            mad = np.median(deviations[known])
 
             # Default outlier threshold (can be made configurable)
             k = getattr(settings, "PRICE_OUTLIER_K", 3.5)
 
-            # Filter out price outliers
+            # Filter out price outliers (unknown prices are never outliers)
             outlier_threshold = k * mad if mad > 0 else float("inf")
-            price_filtered = []
-
-            for comp in filtered:
-                if (
-                    comp.price is not None
-                    and abs(comp.price - median_price) > outlier_threshold
-                ):
-                    diagnostics["price"] += 1
-                else:
-                    price_filtered.append(comp)
-
-            filtered = price_filtered
-
-    # Add quality scores
-    for comp in filtered:
-        similarity = comp.meta.get("similarity", 0.0)
-        # Simple recency weight (newer = higher score)
-        if comp.sold_at:
-            days_ago = (datetime.now(timezone.utc) - comp.sold_at).days
-            recency_weight = max(0.1, 1.0 - (days_ago / days_lookback))
-        else:
-            recency_weight = 0.5  # Unknown date gets middle score
-
-        quality_score = 0.7 * similarity + 0.3 * recency_weight
+            outliers = known & (deviations > outlier_threshold)
+
+            diagnostics["price"] += int(np.count_nonzero(outliers))
+            kept = ~outliers
+            filtered = [comp for comp, keep in zip(filtered, kept) if keep]
+            filtered_ts = filtered_ts[kept]
+
+    # Add quality scores in one vector op over the survivors
+    similarities = np.fromiter(
+        (comp.meta.get("similarity", 0.0) for comp in filtered),
+        dtype=np.float64,
+        count=len(filtered),
+    )
+    # Simple recency weight (newer = higher score); unknown date gets middle score
+    days_ago = np.floor_divide(now_ts - filtered_ts, 86400)
+    recency_weights = np.where(
+        np.isnan(filtered_ts),
+        0.5,
+        np.maximum(0.1, 1.0 - days_ago / days_lookback),
+    )
+    quality_scores = 0.7 * similarities + 0.3 * recency_weights
+    for comp, quality_score in zip(filtered, quality_scores.tolist()):
         comp.meta["quality_score"] = quality_score
         comp.match_score = quality_score  # Update the main match score too
 
     return filtered, diagnostics
 
 
+_ITEM_SELECTORS = ("li.s-item", "div.s-item__wrapper")
+_TITLE_SELECTOR = ".s-item__title"
+_PRICE_SELECTOR = ".s-item__price"
+_LINK_SELECTOR = "a.s-item__link"
+_DATE_SELECTOR = ".s-item__ended-date, .s-item__title--tagblock span"
+
+# Precompiled soupsieve matchers for the BeautifulSoup fallback
+_SOUP_ITEM_SELECTORS = tuple(soupsieve.compile(s) for s in _ITEM_SELECTORS)
+_SOUP_TITLE_SELECTOR = soupsieve.compile(_TITLE_SELECTOR)
+_SOUP_PRICE_SELECTOR = soupsieve.compile(_PRICE_SELECTOR)
+_SOUP_LINK_SELECTOR = soupsieve.compile(_LINK_SELECTOR)
+_SOUP_DATE_SELECTOR = soupsieve.compile(_DATE_SELECTOR)
+
+
+def _iter_item_fields(
+    html: str,
+) -> Iterator[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]]:
+    """
+    Yield (title, raw_price, url, date_text) for each listing in the page.
+
+    Uses selectolax's lexbor parser when installed (much faster on full
+    result pages) and falls back to BeautifulSoup with identical selectors.
+    """
+    if HAS_SELECTOLAX:
+        tree = LexborHTMLParser(html)
+        items = tree.css(_ITEM_SELECTORS[0]) or tree.css(_ITEM_SELECTORS[1])
+        for el in items:
+            title_el = el.css_first(_TITLE_SELECTOR)
+            price_el = el.css_first(_PRICE_SELECTOR)
+            link_el = el.css_first(_LINK_SELECTOR)
+            date_el = el.css_first(_DATE_SELECTOR)
+            yield (
+                title_el.text(strip=True) if title_el else None,
+                price_el.text(strip=True) if price_el else None,
+                link_el.attributes.get("href") if link_el else None,
+                date_el.text(separator=" ", strip=True) if date_el else None,
+            )
+        return
+
+    soup = BeautifulSoup(html, "html.parser")
+    items = _SOUP_ITEM_SELECTORS[0].select(soup) or _SOUP_ITEM_SELECTORS[1].select(soup)
+    for el in items:
+        title_el = _SOUP_TITLE_SELECTOR.select_one(el)
+        price_el = _SOUP_PRICE_SELECTOR.select_one(el)
+        link_el = _SOUP_LINK_SELECTOR.select_one(el)
+        date_el = _SOUP_DATE_SELECTOR.select_one(el)
+        yield (
+            title_el.get_text(strip=True) if title_el else None,
+            price_el.get_text(strip=True) if price_el else None,
+            link_el.get("href") if link_el else None,
+            date_el.get_text(" ", strip=True) if date_el else None,
+        )
+
+
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+# 'Mon D, YYYY' or 'Mon DD YYYY' at the end of the text
+_SOLD_DATE_RE = re.compile(r"([A-Za-z]{3})\s+(\d{1,2}),?\s+(\d{4})\s*$")
+
+
+def _parse_sold_date(date_txt: str) -> Optional[datetime]:
+    """Parse the trailing 'Mon D, YYYY' sold date of a listing (UTC)."""
+    # Fast path for eBay's usual format; strptime handles anything else
+    m = _SOLD_DATE_RE.search(date_txt)
+    if m and m[1].lower() in _MONTHS:
+        try:
+            return datetime(
+                int(m[3]), _MONTHS[m[1].lower()], int(m[2]), tzinfo=timezone.utc
+            )
+        except ValueError:
+            return None
+
+    tail = date_txt[-12:]
+    for fmt in ("%b %d, %Y", "%b %d %Y"):
+        try:
+            return datetime.strptime(tail, fmt).replace(tzinfo=timezone.utc)
+        except Exception:
+            pass
+    return None
+
+
+def _parse_sold_items(
+    html: str,
+    q: str,
+    condition_hint: Optional[str],
+    max_results: int,
+    days_lookback: int,
+) -> List[SoldComp]:
+    """Parse sold/completed listing HTML into unfiltered SoldComp candidates."""
+    raw_comps: List[SoldComp] = []
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days_lookback)
+
+    for title, raw_price, url, date_txt in _iter_item_fields(html):
+        price = _parse_price(raw_price or "")
+        if not title or not price:
+            continue
+
+        sold_at = _parse_sold_date(date_txt) if date_txt else None
+
+        # Only apply basic recency cutoff here, more sophisticated filtering below
+        if sold_at and sold_at < cutoff:
+            continue
+
+        raw_comps.append(
+            SoldComp(
+                source="ebay",
+                title=title[:300],
+                price=price,
+                condition=(condition_hint or "Unknown"),
+                sold_at=sold_at,
+                url=url,
+                id=None,
+                match_score=0.0,  # Will be computed in filtering step
+                meta={"raw_price": raw_price, "query": q, "href": url},
+            )
+        )
+        if len(raw_comps) >= max_results * 2:  # Get more candidates for filtering
+            break
+
+    return raw_comps
+
+
 def fetch_sold_comps(
     query: str,
     brand: Optional[str] = None,
@@ -473,94 +715,39 @@ def fetch_sold_comps(
 
     if cached_data is not None:
         # Reconstruct SoldComp objects from cached data
-        return [
-            SoldComp(
-                source=comp.get("source", "ebay"),
-                title=comp.get("title", ""),
-                price=comp.get("price"),
-                condition=comp.get("condition", "Unknown"),
-                sold_at=(
-                    datetime.fromisoformat(comp["sold_at"])
-                    if comp.get("sold_at")
-                    else None
-                ),
-                url=comp.get("url"),
-                id=comp.get("id"),
-                match_score=comp.get("match_score", 0.0),
-                meta=comp.get("meta", {}),
-            )
-            for comp in cached_data
-        ]
+        return _records_to_comps(cached_data)
 
     # Build targeted query using new query builder
     q = _build_targeted_query(query, brand, model, upc, asin)
 
-    try:
-        # Use a session for better cookie handling and connection reuse
-        with requests.Session() as session:
-            # First, visit eBay homepage to establish session
-            session.get("https://www.ebay.com", headers=_headers(), timeout=15)
-            _sleep_jitter(base=1.0, spread=0.8)  # Longer delay after homepage visit
-
-            # Then make the actual search request
-            resp = session.get(_sold_completed_url(q), headers=_headers(), timeout=20)
-            resp.raise_for_status()
-            _sleep_jitter(base=1.2, spread=1.0)  # Longer delay after search
-    except requests.RequestException:
-        # On network error, return empty list rather than raising
-        return []
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    items = soup.select("li.s-item") or soup.select("div.s-item__wrapper")
-
-    # Parse all items first, then filter
-    raw_comps: List[SoldComp] = []
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days_lookback)
-
-    for el in items:
-        title_el = el.select_one(".s-item__title")
-        price_el = el.select_one(".s-item__price")
-        link_el = el.select_one("a.s-item__link")
-        date_el = el.select_one(".s-item__ended-date, .s-item__title--tagblock span")
-
-        title = title_el.get_text(strip=True) if title_el else None
-        raw_price = price_el.get_text(strip=True) if price_el else None
-        price = _parse_price(raw_price or "")
-        url = link_el.get("href") if link_el else None
-        if not title or not price:
-            continue
-
-        sold_at = None
-        if date_el:
-            txt = date_el.get_text(" ", strip=True)
-            for fmt in ("%b %d, %Y", "%b %d %Y"):
-                try:
-                    sold_at = datetime.strptime(txt[-12:], fmt).replace(
-                        tzinfo=timezone.utc
-                    )
-                    break
-                except Exception:
-                    pass
-
-        # Only apply basic recency cutoff here, more sophisticated filtering below
-        if sold_at and sold_at < cutoff:
-            continue
-
-        raw_comps.append(
-            SoldComp(
-                source="ebay",
-                title=title[:300],
-                price=price,
-                condition=(condition_hint or "Unknown"),
-                sold_at=sold_at,
-                url=url,
-                id=None,
-                match_score=0.0,  # Will be computed in filtering step
-                meta={"raw_price": raw_price, "query": q, "href": url},
-            )
+    # Raw scrape cache: keyed by the targeted query, shared across titles
+    scrape_fingerprint = _generate_scrape_fingerprint(
+        q, condition_hint, max_results, days_lookback
+    )
+    raw_comps = _get_cached_scrape(scrape_fingerprint, ttl_sec)
+    if raw_comps is None:
+        try:
+            # Use a session for better cookie handling and connection reuse
+            with requests.Session() as session:
+                # First, visit eBay homepage to establish session
+                session.get("https://www.ebay.com", headers=_headers(), timeout=15)
+                _sleep_jitter(base=1.0, spread=0.8)  # Longer delay after homepage visit
+
+                # Then make the actual search request
+                resp = session.get(
+                    _sold_completed_url(q), headers=_headers(), timeout=20
+                )
+                resp.raise_for_status()
+                _sleep_jitter(base=1.2, spread=1.0)  # Longer delay after search
+        except requests.RequestException:
+            # On network error, return empty list rather than raising
+            return []
+
+        raw_comps = _parse_sold_items(
+            resp.text, q, condition_hint, max_results, days_lookback
         )
-        if len(raw_comps) >= max_results * 2:  # Get more candidates for filtering
-            break
+        if raw_comps:
+            _cache_scrape(scrape_fingerprint, raw_comps)
 
     # Apply advanced filtering
     similarity_min = getattr(settings, "SCRAPER_SIMILARITY_MIN", 0.70)
@@ -576,20 +763,7 @@ def fetch_sold_comps(
         _cache_ebay_results(fingerprint, comps)
 
         # Also cache in old system for backward compatibility
-        cache_data = [
-            {
-                "source": comp.source,
-                "title": comp.title,
-                "price": comp.price,
-                "condition": comp.condition,
-                "sold_at": comp.sold_at.isoformat() if comp.sold_at else None,
-                "url": comp.url,
-                "id": comp.id,
-                "match_score": comp.match_score,
-                "meta": comp.meta,
-            }
-            for comp in comps
-        ]
+        cache_data = _comps_to_records(comps)
         set_cached_comps(
             source="ebay",
             comps_data=cache_data,
@@ -2,28 +2,127 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
 import sqlite3
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from ..cache_db import ThreadLocalConnections
 from ..config import settings
 
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
 # Cache database path
 _DB_PATH = Path("data/cache/external_comps.sqlite")
 _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 _lock = threading.Lock()
+# Clock for entry timestamps. Wall-clock seconds, since rows outlive the
+# process; tests swap it to move time forward without sleeping.
+_now = time.time
+
+# Version byte prefixed to msgpack payloads; legacy rows are JSON text
+_MSGPACK_PAYLOAD = b"\x01"
+
+
+def _encode_payload(comps_data: List[Dict[str, Any]]) -> bytes | str:
+    """Serialize comps for storage, preferring msgpack when installed."""
+    if HAS_MSGPACK:
+        return _MSGPACK_PAYLOAD + msgpack.packb(comps_data, use_bin_type=True)
+    return json.dumps(comps_data)
+
+
+def _decode_payload(payload: bytes | str) -> List[Dict[str, Any]]:
+    """Deserialize a stored payload written by either encoding."""
+    if isinstance(payload, bytes) and payload[:1] == _MSGPACK_PAYLOAD:
+        return msgpack.unpackb(payload[1:], raw=False, strict_map_key=False)
+    return json.loads(payload)
+
+
+# In-process front for the SQLite cache: (db path, query_sig, source) ->
+# (payload, timestamp). Payloads stay encoded so every hit returns fresh objects.
+_MEM_MAX = 1024
+_mem: OrderedDict[Tuple[str, str, str], Tuple[bytes | str, int]] = OrderedDict()
+
+
+def _mem_put(key: Tuple[str, str, str], payload: bytes | str, timestamp: int) -> None:
+    """Remember a cache row in memory, evicting the least recently used."""
+    _mem[key] = (payload, timestamp)
+    _mem.move_to_end(key)
+    if len(_mem) > _MEM_MAX:
+        _mem.popitem(last=False)
+
+
+# In-memory mode: one shared database loaded from and saved back to _DB_PATH
+_memory_conn: Optional[sqlite3.Connection] = None
+_memory_db_key: Optional[str] = None
+
+
+def _db() -> sqlite3.Connection:
+    """Return this thread's cache connection, reopening if _DB_PATH changed."""
+    if getattr(settings, "EXTERNAL_COMPS_CACHE_IN_MEMORY", False):
+        return _memory_db()
+
+    return _conns.get(_DB_PATH)
 
 
-def _db():
-    """Create and configure database connection, migrating schema if needed."""
-    conn = sqlite3.connect(_DB_PATH, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA busy_timeout=5000;")
+def _memory_db() -> sqlite3.Connection:
+    """Return the shared in-memory cache, loading it from _DB_PATH on first use."""
+    global _memory_conn, _memory_db_key
 
+    db_key = str(_DB_PATH)
+    if _memory_conn is not None:
+        if _memory_db_key == db_key:
+            return _memory_conn
+        _persist_memory_db()
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    if _DB_PATH.exists():
+        disk = sqlite3.connect(_DB_PATH)
+        try:
+            disk.backup(conn)
+        finally:
+            disk.close()
+    _init_schema(conn)
+
+    _memory_conn = conn
+    _memory_db_key = db_key
+    return conn
+
+
+@atexit.register
+def _persist_memory_db() -> None:
+    """Copy the in-memory cache to its disk path and close it."""
+    global _memory_conn, _memory_db_key
+
+    if _memory_conn is None:
+        return
+    try:
+        disk = sqlite3.connect(_memory_db_key)
+        try:
+            _memory_conn.backup(disk)
+        finally:
+            disk.close()
+    except Exception:
+        # Losing an in-memory cache on exit only costs refetches
+        pass
+    finally:
+        _memory_conn.close()
+        _memory_conn = None
+        _memory_db_key = None
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create the cache table and index, migrating legacy schemas."""
     # Create table with desired composite primary key if it doesn't exist
     conn.execute(
         """CREATE TABLE IF NOT EXISTS comps_cache (
@@ -74,7 +173,16 @@ def _db():
         # If PRAGMA fails, leave as-is; subsequent ops still function
         pass
 
-    return conn
+    # Lets clear_expired_cache delete by range instead of scanning the table
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_comps_cache_timestamp "
+        "ON comps_cache(timestamp)"
+    )
+    conn.commit()
+
+
+# One connection per thread, reused while _DB_PATH stays the same
+_conns = ThreadLocalConnections(_init_schema)
 
 
 def _normalize_query_signature(
@@ -105,8 +213,8 @@ def _normalize_query_signature(
     components.sort()
     query_str = "|".join(components)
 
-    # Create hash for shorter key
-    return hashlib.md5(query_str.encode()).hexdigest()
+    # Create hash for shorter key (blake2b is faster than md5 at the same width)
+    return hashlib.blake2b(query_str.encode(), digest_size=16).hexdigest()
 
 
 def get_cached_comps(
@@ -134,32 +242,65 @@ def get_cached_comps(
         title, brand, model, upc, asin, condition_hint
     )
 
+    mem_key = (str(_DB_PATH), query_sig, source)
+
     try:
         with _lock:
-            conn = _db()
-            cur = conn.execute(
-                "SELECT data, timestamp FROM comps_cache WHERE query_sig = ? AND source = ?",
-                (query_sig, source),
-            )
-            row = cur.fetchone()
-            conn.close()
+            row = _mem.get(mem_key)
+            if row is not None:
+                _mem.move_to_end(mem_key)
+            else:
+                conn = _db()
+                cur = conn.execute(
+                    "SELECT data, timestamp FROM comps_cache WHERE query_sig = ? AND source = ?",
+                    (query_sig, source),
+                )
+                row = cur.fetchone()
+                if row:
+                    _mem_put(mem_key, *row)
 
         if not row:
             return None
 
-        data_str, timestamp = row
+        payload, timestamp = row
 
         # Check TTL
-        if int(time.time()) - timestamp > ttl_sec:
+        if int(_now()) - timestamp > ttl_sec:
             return None
 
         # Parse and return data
-        return json.loads(data_str)
+        return _decode_payload(payload)
     except Exception:
         # On any error, treat as cache miss
         return None
 
 
+def _build_row(
+    source: str,
+    comps_data: List[Dict[str, Any]],
+    title: Optional[str] = None,
+    brand: Optional[str] = None,
+    model: Optional[str] = None,
+    upc: Optional[str] = None,
+    asin: Optional[str] = None,
+    condition_hint: Optional[str] = None,
+    timestamp: Optional[int] = None,
+) -> Tuple[str, bytes | str, str, int]:
+    """Build the (query_sig, data, source, timestamp) row for one cache entry."""
+    query_sig = _normalize_query_signature(
+        title, brand, model, upc, asin, condition_hint
+    )
+    if timestamp is None:
+        timestamp = int(_now())
+    return (query_sig, _encode_payload(comps_data), source, timestamp)
+
+
+_INSERT_SQL = (
+    "INSERT OR REPLACE INTO comps_cache (query_sig, data, source, timestamp) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
 def set_cached_comps(
     source: str,
     comps_data: List[Dict[str, Any]],
@@ -178,19 +319,42 @@ def set_cached_comps(
         comps_data: List of comp dictionaries to cache
         title, brand, model, upc, asin, condition_hint: Query parameters
     """
-    query_sig = _normalize_query_signature(
-        title, brand, model, upc, asin, condition_hint
+    set_cached_comps_many(
+        [
+            {
+                "source": source,
+                "comps_data": comps_data,
+                "title": title,
+                "brand": brand,
+                "model": model,
+                "upc": upc,
+                "asin": asin,
+                "condition_hint": condition_hint,
+            }
+        ]
     )
 
+
+def set_cached_comps_many(entries: Iterable[Dict[str, Any]]) -> None:
+    """
+    Store several cache entries in a single transaction.
+
+    Args:
+        entries: Dicts with the keyword arguments of set_cached_comps
+            (source, comps_data and optional query parameters)
+    """
     try:
+        timestamp = int(_now())
+        rows = [_build_row(**entry, timestamp=timestamp) for entry in entries]
+        if not rows:
+            return
         with _lock:
             conn = _db()
-            conn.execute(
-                "INSERT OR REPLACE INTO comps_cache (query_sig, data, source, timestamp) VALUES (?, ?, ?, ?)",
-                (query_sig, json.dumps(comps_data), source, int(time.time())),
-            )
-            conn.commit()
-            conn.close()
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+            db_key = str(_DB_PATH)
+            for query_sig, payload, source, row_ts in rows:
+                _mem_put((db_key, query_sig, source), payload, row_ts)
     except Exception:
         # Silently fail on cache write errors
         pass
@@ -209,7 +373,7 @@ def clear_expired_cache() -> int:
         ttl_days = settings.EXTERNAL_COMPS_CACHE_TTL_DAYS
 
     ttl_sec = ttl_days * 86400
-    cutoff_time = int(time.time()) - ttl_sec
+    cutoff_time = int(_now()) - ttl_sec
 
     try:
         with _lock:
@@ -219,7 +383,8 @@ def clear_expired_cache() -> int:
             )
             deleted_count = cur.rowcount
             conn.commit()
-            conn.close()
+            for key in [k for k, (_, ts) in _mem.items() if ts < cutoff_time]:
+                del _mem[key]
         return deleted_count
     except Exception:
         return 0
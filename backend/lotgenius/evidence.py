@@ -11,9 +11,10 @@ from __future__ import annotations
 import logging
 import os
 import time
+from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 
@@ -297,48 +298,48 @@ def _count_external_comps(
     total_external = 0
 
     for evidence in evidence_ledger:
-        if "external_comps_summary" in evidence:
-            ext_summary = evidence["external_comps_summary"]
-            if not isinstance(ext_summary, dict):
+        ext_summary = evidence.get("external_comps_summary")
+        if not isinstance(ext_summary, dict):
+            continue
+
+        # Prefer num_comps when present and valid
+        count = _as_comp_count(ext_summary.get("num_comps"))
+        if count is not None:
+            total_external += count
+            continue
+
+        # Fallback to summing by_source values if present
+        by_source = ext_summary.get("by_source")
+        if isinstance(by_source, dict):
+            try:
+                total_external += sum(
+                    int(v)
+                    for v in by_source.values()
+                    if isinstance(v, (int, float)) and v >= 0
+                )
                 continue
+            except (ValueError, TypeError):
+                pass
 
-            # Prefer num_comps when present and valid
-            if "num_comps" in ext_summary:
-                try:
-                    count = int(ext_summary["num_comps"])
-                    if count >= 0:
-                        total_external += count
-                        continue
-                except (ValueError, TypeError):
-                    pass
-
-            # Fallback to summing by_source values if present
-            if "by_source" in ext_summary and isinstance(
-                ext_summary["by_source"], dict
-            ):
-                try:
-                    by_source_sum = sum(
-                        int(v)
-                        for v in ext_summary["by_source"].values()
-                        if isinstance(v, (int, float)) and v >= 0
-                    )
-                    total_external += by_source_sum
-                    continue
-                except (ValueError, TypeError):
-                    pass
-
-            # Legacy fallback for total_comps
-            if "total_comps" in ext_summary:
-                try:
-                    count = int(ext_summary["total_comps"])
-                    if count >= 0:
-                        total_external += count
-                except (ValueError, TypeError):
-                    pass
+        # Legacy fallback for total_comps
+        count = _as_comp_count(ext_summary.get("total_comps"))
+        if count is not None:
+            total_external += count
 
     return total_external
 
 
+def _as_comp_count(value: Any) -> Optional[int]:
+    """Coerce a comps count to a non-negative int; None when missing/invalid."""
+    if value is None:
+        return None
+    try:
+        count = int(value)
+    except (ValueError, TypeError):
+        return None
+    return count if count >= 0 else None
+
+
 def _detect_secondary_signals(
     item: Dict[str, Any], evidence_ledger: Optional[List[Dict[str, Any]]]
 ) -> List[str]:
@@ -504,8 +505,42 @@ def mark_items_as_upside(df: pd.DataFrame) -> pd.DataFrame:
     return df_marked
 
 
+class EvidenceLedger:
+    """
+    Append-only list of evidence records with a per-source index.
+
+    Iterates like the plain list it replaces; by_source() avoids rescanning
+    every record when looking up one source.
+    """
+
+    def __init__(self) -> None:
+        self._records: List[Dict[str, Any]] = []
+        self._by_source: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self._records.append(record)
+        self._by_source[record.get("source")].append(record)
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._by_source.clear()
+
+    def by_source(self, source: str) -> List[Dict[str, Any]]:
+        """Return the records written for one source, in insertion order."""
+        return list(self._by_source.get(source, ()))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+
 # Global evidence ledger for real evidence writing
-_global_evidence_ledger: List[Dict[str, Any]] = []
+_global_evidence_ledger = EvidenceLedger()
 
 
 def write_evidence(
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import codecs
 import csv
+import itertools
+import sys
+import warnings
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from .ids import extract_ids
+import pandas as pd
+
+from .ids import ID_COLUMNS, extract_ids_frame
 
 
 class FeedValidationError(Exception):
@@ -31,6 +37,20 @@ class FeedValidationError(Exception):
             super().__init__(message)
 
 
+# Condition spellings (lowercased) mapped to their safe bucket
+_CONDITION_BUCKETS: Dict[str, str] = {
+    alias: bucket
+    for bucket, aliases in (
+        ("New", ("new", "brand new", "factory sealed", "unopened", "mint")),
+        ("Like New", ("like new", "open box", "excellent", "mint condition")),
+        ("Used - Good", ("good", "used - good", "very good", "fine")),
+        ("Used - Fair", ("fair", "used - fair", "acceptable", "worn")),
+        ("For Parts", ("poor", "damaged", "broken", "for parts", "salvage")),
+    )
+    for alias in aliases
+}
+
+
 def normalize_condition(condition: str) -> str:
     """
     Normalize condition string to safe buckets.
@@ -41,30 +61,8 @@ def normalize_condition(condition: str) -> str:
     if not isinstance(condition, str):
         return "Used"
 
-    condition_lower = condition.strip().lower()
-
-    # New condition mappings
-    if condition_lower in ("new", "brand new", "factory sealed", "unopened", "mint"):
-        return "New"
-
-    # Like new condition mappings
-    if condition_lower in ("like new", "open box", "excellent", "mint condition"):
-        return "Like New"
-
-    # Good condition mappings
-    if condition_lower in ("good", "used - good", "very good", "fine"):
-        return "Used - Good"
-
-    # Fair condition mappings
-    if condition_lower in ("fair", "used - fair", "acceptable", "worn"):
-        return "Used - Fair"
-
-    # Poor/damaged condition mappings
-    if condition_lower in ("poor", "damaged", "broken", "for parts", "salvage"):
-        return "For Parts"
-
     # Default to Used for anything unrecognized
-    return "Used"
+    return _CONDITION_BUCKETS.get(condition.strip().lower(), "Used")
 
 
 def normalize_brand(brand: str) -> str:
@@ -83,7 +81,7 @@ def normalize_string_field(value: Any) -> str:
 
 def normalize_numeric_field(value: Any) -> Optional[float]:
     """Normalize numeric field with safe conversion."""
-    if value is None or value == "":
+    if value is None or (isinstance(value, str) and not value.strip()):
         return None
     try:
         return float(value)
@@ -127,6 +125,10 @@ def validate_required_fields(record: Dict[str, str], row_idx: int) -> None:
         )
 
 
+# Tried in order; latin1 decodes any byte sequence
+_FEED_ENCODINGS = ("utf-8-sig", "utf-8", "cp1252", "latin1")
+
+
 def load_feed_csv(path: str) -> List[Dict[str, Any]]:
     """
     Load and normalize a feed CSV file.
@@ -145,26 +147,51 @@ def load_feed_csv(path: str) -> List[Dict[str, Any]]:
         FileNotFoundError: If file doesn't exist
         UnicodeDecodeError: If file encoding issues
     """
+    return list(itertools.chain.from_iterable(load_feed_csv_iter(path)))
+
+
+def load_feed_csv_iter(
+    path: str, chunksize: int = 10_000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a feed CSV as lists of normalized records, chunksize rows at a time.
+
+    Applies the same validation as load_feed_csv but holds only one chunk in
+    memory. Chunks before an invalid row are yielded before the
+    FeedValidationError is raised; row numbers in errors are file-global.
+    """
     path_obj = Path(path)
     if not path_obj.exists():
         raise FileNotFoundError(f"Feed CSV file not found: {path}")
 
-    # Try UTF-8 first, then Windows-safe fallback
-    for encoding in ["utf-8-sig", "utf-8", "cp1252", "latin1"]:
+    encoding = _detect_encoding(path_obj)
+    if encoding is None:
+        # If all encodings fail, raise domain error
+        raise FeedValidationError(
+            f"Unable to read CSV file with supported encodings: {path}"
+        )
+
+    with open(path_obj, "r", encoding=encoding, newline="") as f:
+        yield from _iter_csv_chunks(f, chunksize)
+
+
+def _detect_encoding(path_obj: Path) -> Optional[str]:
+    """Return the first of _FEED_ENCODINGS that decodes the whole file."""
+    for encoding in _FEED_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
         try:
-            with open(path_obj, "r", encoding=encoding, newline="") as f:
-                return _process_csv_content(f, str(path_obj))
+            with open(path_obj, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(block)
+            decoder.decode(b"", final=True)
+            return encoding
         except UnicodeDecodeError:
             continue
-
-    # If all encodings fail, raise domain error
-    raise FeedValidationError(
-        f"Unable to read CSV file with supported encodings: {path}"
-    )
+    return None
 
 
-def _process_csv_content(file_obj, filename: str) -> List[Dict[str, Any]]:
-    """Process CSV content from file object."""
+def _iter_csv_chunks(file_obj, chunksize: int) -> Iterator[List[Dict[str, Any]]]:
+    """Parse, validate and normalize CSV content from a file object in chunks."""
     try:
         # Detect CSV dialect
         sample = file_obj.read(1024)
@@ -177,16 +204,75 @@ def _process_csv_content(file_obj, filename: str) -> List[Dict[str, Any]]:
             # Fall back to default Excel dialect
             dialect = csv.excel
 
-        reader = csv.DictReader(file_obj, dialect=dialect)
+        # Parse in C as plain strings; row validation/normalization is vectorized
+        read_options = dict(
+            sep=dialect.delimiter,
+            quotechar=dialect.quotechar,
+            doublequote=dialect.doublequote,
+            skipinitialspace=dialect.skipinitialspace,
+            dtype=str,
+            keep_default_na=False,
+            index_col=False,
+            chunksize=chunksize,
+        )
+        rows_done = 0
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", pd.errors.ParserWarning)
+                reader = pd.read_csv(file_obj, **read_options)
+        except pd.errors.EmptyDataError:
+            raise FeedValidationError("CSV file has no headers")
+        try:
+            for df in _quiet_chunks(reader):
+                yield _process_chunk(df, first=rows_done == 0)
+                rows_done += len(df)
+        except pd.errors.ParserError:
+            # The C parser rejects some ragged rows; resume with the python
+            # engine truncating them, skipping rows already yielded
+            file_obj.seek(0)
+            width = len(next(csv.reader(file_obj, dialect)))
+            file_obj.seek(0)
+            reader = pd.read_csv(
+                file_obj,
+                engine="python",
+                on_bad_lines=lambda fields: fields[:width],
+                **read_options,
+            )
+            for df in _quiet_chunks(reader):
+                df = df[df.index >= rows_done]
+                if df.empty and rows_done:
+                    continue
+                yield _process_chunk(df, first=rows_done == 0)
+                rows_done += len(df)
+
+    except (csv.Error, pd.errors.ParserError) as e:
+        raise FeedValidationError(f"CSV parsing error: {e}")
+
 
+def _quiet_chunks(reader) -> Iterator[pd.DataFrame]:
+    """
+    Iterate a chunked reader with ParserWarning silenced per read.
+
+    Surplus fields are dropped, as csv.DictReader ignores them too; the filter
+    is not held across yields so callers' warning state is left alone.
+    """
+    while True:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", pd.errors.ParserWarning)
+            df = next(reader, None)
+        if df is None:
+            return
+        yield df
+
+
+def _process_chunk(df: pd.DataFrame, first: bool) -> List[Dict[str, Any]]:
+    """Validate and normalize one raw chunk; header checks run on the first."""
+    if first:
         # Validate required columns exist
         required_columns = {"title"}
         id_columns = {"brand", "asin", "upc", "ean", "upc_ean_asin"}
 
-        if not reader.fieldnames:
-            raise FeedValidationError("CSV file has no headers")
-
-        fieldnames = set(reader.fieldnames)
+        fieldnames = set(df.columns)
 
         # Check required columns
         missing_required = required_columns - fieldnames
@@ -201,29 +287,96 @@ def _process_csv_content(file_obj, filename: str) -> List[Dict[str, Any]]:
                 f"At least one ID column required: {', '.join(id_columns)}"
             )
 
-        # Process records
-        records = []
-        for row_idx, record in enumerate(reader, start=2):  # Start at 2 for header row
-            try:
-                # Validate required fields for this row
-                validate_required_fields(record, row_idx)
+        if df.empty:
+            raise FeedValidationError("CSV file contains no data rows")
 
-                # Normalize the record
-                normalized = normalize_record(record)
-                records.append(normalized)
+    # Short rows leave NaN even with keep_default_na=False
+    df = df.fillna("")
+    _validate_feed_frame(df)
+    return _normalize_feed_frame(df).to_dict(orient="records")
 
-            except FeedValidationError:
-                raise  # Re-raise with context
-            except Exception as e:
-                raise FeedValidationError(f"Error processing row: {e}", row=row_idx)
 
-        if not records:
-            raise FeedValidationError("CSV file contains no data rows")
+def _validate_feed_frame(df: pd.DataFrame) -> None:
+    """
+    Vectorized validate_required_fields over every row of a raw feed frame.
 
-        return records
+    Raises the same error validate_required_fields would for the first bad
+    row (rows are numbered from 2 to account for the header).
+    """
+    id_fields = ["asin", "upc", "ean", "upc_ean_asin", "brand"]
+    title_ok = df["title"].str.strip() != ""
+    has_id = pd.Series(False, index=df.index)
+    for field in id_fields:
+        if field in df.columns:
+            has_id |= df[field].str.strip() != ""
 
-    except csv.Error as e:
-        raise FeedValidationError(f"CSV parsing error: {e}")
+    bad_rows = ~(title_ok & has_id)
+    if not bad_rows.any():
+        return
+
+    # Chunk indexes continue across the file, so labels give global row numbers
+    first_bad = int(bad_rows.to_numpy().argmax())
+    validate_required_fields(df.iloc[first_bad].to_dict(), int(df.index[first_bad]) + 2)
+
+
+def _normalize_feed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized normalize_record over a raw (all-string) feed frame.
+
+    Produces the same columns, in the same order, as normalize_record.
+    """
+
+    def column(name: str) -> pd.Series:
+        if name in df.columns:
+            return df[name]
+        return pd.Series("", index=df.index)
+
+    def string_field(name: str) -> pd.Series:
+        return column(name).str.strip()
+
+    def numeric_field(name: str) -> pd.Series:
+        values = pd.to_numeric(column(name).str.strip(), errors="coerce")
+        return values.astype("float64")
+
+    out = pd.DataFrame(index=df.index)
+    out["title"] = string_field("title")
+    for name in ("asin", "upc", "ean", "upc_ean_asin"):
+        out[name] = string_field(name)
+    # Brands repeat heavily across rows; interning shares one string per brand
+    out["brand"] = column("brand").str.strip().str.lower().map(sys.intern)
+    for name in (
+        "model",
+        "notes",
+        "category",
+        "color_size_variant",
+        "lot_id",
+        "sku_local",
+    ):
+        out[name] = string_field(name)
+
+    # Condition with safe bucketing (missing column behaves like "Used")
+    out["condition"] = (
+        column("condition")
+        .str.strip()
+        .str.lower()
+        .map(_CONDITION_BUCKETS)
+        .fillna("Used")
+    )
+
+    # Numeric fields: unparseable/empty -> None, quantity falls back to 1.0
+    quantity = numeric_field("quantity")
+    out["quantity"] = quantity.where(quantity.notna() & (quantity != 0), 1.0)
+    for name in ("est_cost_per_unit", "msrp"):
+        values = numeric_field(name)
+        out[name] = values.astype(object).where(values.notna(), None)
+
+    # Category hint only used when no category was given
+    category_hint = string_field("category_hint")
+    out["category_hint"] = out["category"].where(
+        (column("category_hint") == "") | (out["category"] != ""), category_hint
+    )
+
+    return out
 
 
 def normalize_record(record: Dict[str, str]) -> Dict[str, Any]:
@@ -288,7 +441,8 @@ def feed_to_pipeline_items(feed_records: List[Dict[str, Any]]) -> List[Dict[str,
     Convert normalized feed records to pipeline-ready items.
 
     This function:
-    1. Applies ID extraction and normalization via extract_ids()
+    1. Applies ID extraction and normalization (extract_ids() semantics,
+       computed column-wise for the whole feed)
     2. Ensures all required pipeline fields are present
     3. Maintains original feed fields as passthrough data
 
@@ -298,27 +452,55 @@ def feed_to_pipeline_items(feed_records: List[Dict[str, Any]]) -> List[Dict[str,
     Returns:
         List of pipeline-ready items
     """
+    return _to_pipeline_items(list(feed_records), start=1)
+
+
+def iter_pipeline_items(
+    record_chunks: Iterable[List[Dict[str, Any]]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming feed_to_pipeline_items over chunks, e.g. from load_feed_csv_iter.
+
+    Default sku_local numbering (FEED_0001, ...) runs across chunk boundaries,
+    so the items match feed_to_pipeline_items on the concatenated records.
+    """
+    start = 1
+    for chunk in record_chunks:
+        yield from _to_pipeline_items(chunk, start=start)
+        start += len(chunk)
+
+
+def _to_pipeline_items(
+    feed_records: List[Dict[str, Any]], start: int
+) -> List[Dict[str, Any]]:
+    """Build pipeline items, numbering default SKUs from start."""
+    if not feed_records:
+        return []
+
+    ids = extract_ids_frame(
+        pd.DataFrame(
+            {key: [r.get(key) for r in feed_records] for key in ID_COLUMNS},
+            dtype=object,
+        )
+    )
+    id_keys = list(ids.columns)
+    id_rows = zip(*(ids[key].tolist() for key in id_keys))
     pipeline_items = []
 
-    for record in feed_records:
+    for i, (record, id_values) in enumerate(zip(feed_records, id_rows), start=start):
         # Create pipeline item starting with the normalized record
         item = dict(record)
-
-        # Apply ID extraction and normalization
-        ids = extract_ids(record)
-        item.update(ids)
+        item.update(zip(id_keys, id_values))
 
         # Ensure required pipeline fields exist with defaults
-        pipeline_defaults = {
-            "sku_local": item.get("sku_local") or f"FEED_{len(pipeline_items)+1:04d}",
-            "quantity": item.get("quantity") or 1.0,
-            "condition": item.get("condition") or "Used",
-            "category_hint": item.get("category_hint") or item.get("category") or "",
-        }
-
-        for key, default_value in pipeline_defaults.items():
-            if not item.get(key):
-                item[key] = default_value
+        if not item.get("sku_local"):
+            item["sku_local"] = f"FEED_{i:04d}"
+        if not item.get("quantity"):
+            item["quantity"] = 1.0
+        if not item.get("condition"):
+            item["condition"] = "Used"
+        if not item.get("category_hint"):
+            item["category_hint"] = item.get("category") or ""
 
         pipeline_items.append(item)
 
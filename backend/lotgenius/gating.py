@@ -1,16 +1,53 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
 
 from .config import settings
 
+# Title words that mark a listing as a generic/mixed lot rather than one product
+_GENERIC_TOKENS = frozenset(
+    {
+        "bundle",
+        "bundles",
+        "lot",
+        "lots",
+        "assorted",
+        "various",
+        "pack",
+        "packs",
+        "generic",
+        "case",
+        "cases",
+        "piece",
+        "pieces",
+        "damaged",
+        "broken",
+        "repair",
+        "wholesale",
+    }
+)
+_GENERIC_PHRASES = ("for parts",)
+_WORD_RE = re.compile(r"[a-z]+")
+# Column-wise equivalent of the token/phrase test in _ambiguity_flags
+_GENERIC_TITLE_RE = (
+    r"(?<![a-z])(?:"
+    + "|".join(sorted(_GENERIC_TOKENS))
+    + r")(?![a-z])|"
+    + "|".join(re.escape(p) for p in _GENERIC_PHRASES)
+)
+
 
 @dataclass
 class GateResult:
     passed: bool
     reason: str
-    tags: list[str]
+    tags: tuple[str, ...]
     core_included: bool  # whether to include in ROI core
 
 
@@ -28,24 +65,10 @@ def _ambiguity_flags(item: Dict[str, Any]) -> List[str]:
     # Check for generic terms in title (only if title exists)
     title = (item.get("title") or "").strip()
     if title:
-        generic_terms = {
-            "bundle",
-            "lot",
-            "assorted",
-            "various",
-            "pack",
-            "generic",
-            "case",
-            "piece",
-            "damaged",
-            "broken",
-            "repair",
-            "for parts",
-            "wholesale",
-        }
-
         title_lower = title.lower()
-        if any(term in title_lower for term in generic_terms):
+        if not _GENERIC_TOKENS.isdisjoint(_WORD_RE.findall(title_lower)) or any(
+            phrase in title_lower for phrase in _GENERIC_PHRASES
+        ):
             flags.append("generic:title")
 
     # Only check for missing brand/condition if we have some item metadata to work with
@@ -81,39 +104,64 @@ def _ambiguity_flags(item: Dict[str, Any]) -> List[str]:
     return flags
 
 
+@lru_cache(maxsize=32)
+def _get_gated_brands(gated_brands_csv: str) -> frozenset[str]:
+    """Parse GATED_BRANDS_CSV into a set of lowercased brand names."""
+    return frozenset(
+        b.strip().lower() for b in gated_brands_csv.split(",") if b.strip()
+    )
+
+
+@lru_cache(maxsize=4096)
+def _fold_brand(brand: str) -> str:
+    """Case-fold a brand string; brands come from a small, repeated vocabulary."""
+    folded = brand.lower()
+    return "" if folded == "nan" else folded.strip()
+
+
+_BRAND_GATED_TAGS = ("brand:gated",)
+
+# Hazmat policy -> (tags to add, whether the item is gated out); unknown
+# policies behave like "allow".
+_HAZMAT_DISPATCH: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "exclude": (("hazmat",), True),
+    "review": (("hazmat", "hazmat:review"), False),
+    "allow": (("hazmat", "hazmat:allow"), False),
+}
+
+
+@lru_cache(maxsize=8)
+def _hazmat_action(policy: str | None) -> Tuple[Tuple[str, ...], bool]:
+    """Resolve the raw HAZMAT_POLICY setting to its dispatch entry."""
+    key = (policy or "review").strip().lower()
+    return _HAZMAT_DISPATCH.get(key, _HAZMAT_DISPATCH["allow"])
+
+
 def passes_evidence_gate(
     item: Dict[str, Any],
     sold_comps_count_180d: int,
     has_secondary_signal: bool,
     has_high_trust_id: bool,  # True if UPC/EAN/ASIN matched confidently
 ) -> GateResult:
-    # First enforce brand gating and hazmat policy
     brand_raw = item.get("brand")
-    # Handle pandas NaN properly
-    if brand_raw is None or (
-        hasattr(brand_raw, "__str__") and str(brand_raw).lower() == "nan"
-    ):
-        brand = ""
+    if isinstance(brand_raw, str):
+        brand = _fold_brand(brand_raw)
     else:
-        brand = str(brand_raw).strip().lower()
-    gated = False
-    gated_reason = None
-    tags: list[str] = []
+        # Handle pandas NaN properly
+        brand = "" if brand_raw is None else str(brand_raw).lower()
+        brand = "" if brand == "nan" else brand.strip()
 
-    # Brand gating via comma-separated list in settings
-    if settings.GATED_BRANDS_CSV:
+    # Checks run cheapest-first and return on the first rejection. Brand gating
+    # is a set lookup, so a gated brand skips hazmat and evidence work entirely.
+    if settings.GATED_BRANDS_CSV and brand:
         try:
-            gated_brands = {
-                b.strip().lower()
-                for b in settings.GATED_BRANDS_CSV.split(",")
-                if b.strip()
-            }
+            gated_brands = _get_gated_brands(settings.GATED_BRANDS_CSV)
         except Exception:
-            gated_brands = set()
-        if brand and brand in gated_brands:
-            gated = True
-            gated_reason = f"Brand gated: {item.get('brand')}"
-            tags.append("brand:gated")
+            gated_brands = frozenset()
+        if brand in gated_brands:
+            return GateResult(
+                False, f"Brand gated: {item.get('brand')}", _BRAND_GATED_TAGS, False
+            )
 
     # Hazmat policy (from Keepa or item flag)
     hazmat_flag = False
@@ -123,34 +171,60 @@ def passes_evidence_gate(
         hazmat_flag = bool(item.get("hazmat") or keepa_blob.get("hazmat"))
     except Exception:
         hazmat_flag = bool(item.get("hazmat", False))
-    policy = (settings.HAZMAT_POLICY or "review").strip().lower()
+    tags: Tuple[str, ...] = ()
     if hazmat_flag:
-        tags.append("hazmat")
-        if policy == "exclude":
-            gated = True
-            gated_reason = (
-                gated_reason + "; " if gated_reason else ""
-            ) + "Hazmat excluded"
-        elif policy == "review":
-            # mark for review but allow in core unless other criteria fail
-            tags.append("hazmat:review")
-        else:
-            tags.append("hazmat:allow")
-
-    if gated:
-        return GateResult(False, gated_reason or "Gated by policy", tags, False)
+        # "review" marks for review but allows in core unless other criteria fail
+        tags, hazmat_excluded = _hazmat_action(settings.HAZMAT_POLICY)
+        if hazmat_excluded:
+            return GateResult(False, "Hazmat excluded", tags, False)
 
     # High-trust ID bypass (unchanged behavior)
     if has_high_trust_id:
-        return GateResult(True, "High-trust ID present", ["id:trusted"] + tags, True)
+        return GateResult(True, "High-trust ID present", ("id:trusted",) + tags, True)
 
-    # Confidence-aware adaptive threshold calculation
-    ambiguity_flags = _ambiguity_flags(item)
+    # Confidence-aware adaptive threshold calculation. The outcome depends only
+    # on a few canonical fields, so repeated items (resampling, threshold
+    # sweeps) hit the memoized core instead of recomputing flags.
+    condition_raw = item.get("condition")
+    if condition_raw is None or str(condition_raw).lower() == "nan":
+        condition = ""
+    else:
+        condition = str(condition_raw).strip().lower()
+    passed, reason, core_tags = _confidence_gate(
+        item.get("title") or "",
+        brand,
+        condition,
+        bool(item.get("category")),
+        sold_comps_count_180d,
+        bool(has_secondary_signal),
+        getattr(settings, "EVIDENCE_MIN_COMPS_BASE", 3),
+        getattr(settings, "EVIDENCE_AMBIGUITY_BONUS_PER_FLAG", 1),
+        getattr(settings, "EVIDENCE_MIN_COMPS_MAX", 5),
+    )
+    return GateResult(passed, reason, core_tags + tags, passed)
 
-    # Configuration with safe defaults
-    base_comps = getattr(settings, "EVIDENCE_MIN_COMPS_BASE", 3)
-    bonus_per_flag = getattr(settings, "EVIDENCE_AMBIGUITY_BONUS_PER_FLAG", 1)
-    max_comps = getattr(settings, "EVIDENCE_MIN_COMPS_MAX", 5)
+
+@lru_cache(maxsize=100_000)
+def _confidence_gate(
+    title: Any,
+    brand: str,
+    condition: str,
+    has_category: bool,
+    sold_comps_count_180d: int,
+    has_secondary_signal: bool,
+    base_comps: int,
+    bonus_per_flag: int,
+    max_comps: int,
+) -> Tuple[bool, str, Tuple[str, ...]]:
+    """Adaptive comps threshold for one canonical item; returns (passed, reason, tags)."""
+    ambiguity_flags = _ambiguity_flags(
+        {
+            "title": title,
+            "brand": brand,
+            "condition": condition,
+            "category": has_category,
+        }
+    )
 
     required_comps = min(max_comps, base_comps + bonus_per_flag * len(ambiguity_flags))
 
@@ -160,14 +234,14 @@ def passes_evidence_gate(
 
     # Apply adaptive threshold: ≥required_comps sold comps AND ≥1 secondary signal
     if sold_comps_count_180d >= required_comps and has_secondary_signal:
-        return GateResult(
+        return (
             True,
             "Comps+secondary OK",
-            [f"comps:>={required_comps}", "secondary:yes"]
-            + ambiguity_tags
-            + [req_tag]
-            + tags,
-            True,
+            tuple(
+                [f"comps:>={required_comps}", "secondary:yes"]
+                + ambiguity_tags
+                + [req_tag]
+            ),
         )
 
     # Fail -> exclude from ROI core; keep as upside
@@ -189,6 +263,84 @@ def passes_evidence_gate(
     else:
         reason = "No secondary signals"
 
-    return GateResult(
-        False, reason, fail_tags + ambiguity_tags + [req_tag] + tags, False
+    return False, reason, tuple(fail_tags + ambiguity_tags + [req_tag])
+
+
+def _text_column(items: pd.DataFrame, name: str) -> pd.Series:
+    """String view of a column with missing values (and absent columns) as ''."""
+    if name not in items.columns:
+        return pd.Series("", index=items.index)
+    col = items[name]
+    return col.where(col.notna(), "").astype(str)
+
+
+def _truthy_column(col: pd.Series) -> np.ndarray:
+    """Per-value bool() of a column, vectorized for numeric/bool dtypes."""
+    if col.dtype.kind in "biuf":
+        # NaN != 0, matching bool(float("nan")) in the per-item gate
+        return col.to_numpy() != 0
+    return np.fromiter((bool(v) for v in col), dtype=bool, count=len(col))
+
+
+def passes_evidence_gate_batch(
+    items: pd.DataFrame,
+    sold_comps_count_180d: Any,
+    has_secondary_signal: Any,
+    has_high_trust_id: Any,
+) -> np.ndarray:
+    """
+    Vectorized ``core_included`` for every row of an items frame.
+
+    Row for row this matches ``passes_evidence_gate(...).core_included`` (with
+    missing titles treated as empty). It does not build reasons or tags, so
+    use the per-item gate when those are needed.
+    """
+    n = len(items)
+    comps = np.asarray(sold_comps_count_180d, dtype=np.int64).reshape(n)
+    secondary = np.asarray(has_secondary_signal, dtype=bool).reshape(n)
+    trusted = np.asarray(has_high_trust_id, dtype=bool).reshape(n)
+
+    brand = _text_column(items, "brand").str.lower()
+    brand = brand.where(brand != "nan", "").str.strip()
+
+    rejected = np.zeros(n, dtype=bool)
+    if settings.GATED_BRANDS_CSV:
+        try:
+            gated_brands = _get_gated_brands(settings.GATED_BRANDS_CSV)
+        except Exception:
+            gated_brands = frozenset()
+        rejected |= brand.isin(gated_brands).to_numpy() & (brand != "").to_numpy()
+
+    if _hazmat_action(settings.HAZMAT_POLICY)[1]:
+        hazmat = np.zeros(n, dtype=bool)
+        if "hazmat" in items.columns:
+            hazmat |= _truthy_column(items["hazmat"])
+        if "keepa" in items.columns:
+            hazmat |= np.fromiter(
+                (
+                    bool(k.get("hazmat")) if isinstance(k, dict) else False
+                    for k in items["keepa"]
+                ),
+                dtype=bool,
+                count=n,
+            )
+        rejected |= hazmat
+
+    title = _text_column(items, "title").str.strip()
+    condition = _text_column(items, "condition").str.strip().str.lower()
+    has_title = (title != "").to_numpy()
+    n_flags = (
+        (
+            has_title & title.str.lower().str.contains(_GENERIC_TITLE_RE).to_numpy()
+        ).astype(np.int64)
+        + (has_title & brand.isin(("", "nan")).to_numpy())
+        + condition.isin(("unknown", "unspecified")).to_numpy()
     )
+    required = np.minimum(
+        getattr(settings, "EVIDENCE_MIN_COMPS_MAX", 5),
+        getattr(settings, "EVIDENCE_MIN_COMPS_BASE", 3)
+        + getattr(settings, "EVIDENCE_AMBIGUITY_BONUS_PER_FLAG", 1) * n_flags,
+    )
+    confident = (comps >= required) & secondary
+
+    return ~rejected & (trusted | confident)
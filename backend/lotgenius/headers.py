@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 from rapidfuzz import fuzz, process
 
@@ -82,21 +83,52 @@ SYNONYMS: Dict[str, list[str]] = {
     "lot_id": ["Lot", "Pallet", "Manifest ID", "Auction Lot", "Lot ID"],
 }
 
+
+def _build_candidates() -> Dict[str, str]:
+    """Fuzzy candidate universe (canonical + synonyms) → canonical key."""
+    out = {c: c for c in CANONICAL}
+    for dest, syns in SYNONYMS.items():
+        for syn in syns:
+            out.setdefault(syn, dest)
+    return out
+
+
+# Built once, in a stable order
+_CANDIDATE_CANONICAL = _build_candidates()
+_CANDIDATES = list(_CANDIDATE_CANONICAL)
+
 # Where we remember confirmed header→canonical mappings
 ALIAS_STORE = Path("data/aliases/header_aliases.json")
 
 
+# BOM & zero-widths seen in headers that did not come through a utf-8-sig
+# decode (API payloads, other encodings)
+_ZERO_WIDTH = ("\ufeff", "\u200b", "\u200c", "\u200d", "\u2060")
+
+
 def _normalize(s: str) -> str:
     if s is None:
         return ""
-    # Strip BOM & zero-widths seen in CSVs
-    zw = ["\ufeff", "\u200b", "\u200c", "\u200d", "\u2060"]
-    for z in zw:
-        s = s.replace(z, "")
+    for z in _ZERO_WIDTH:
+        if z in s:
+            s = s.replace(z, "")
     s = s.strip().lower()
     return "".join(ch for ch in s if ch.isalnum())
 
 
+def _build_exact() -> Dict[str, str]:
+    """Normalized canonical/synonym spelling → canonical key (first wins)."""
+    out: Dict[str, str] = {}
+    for dest, syns in SYNONYMS.items():
+        for spelling in [dest, *syns]:
+            out.setdefault(_normalize(spelling), dest)
+    return out
+
+
+# Exact (normalized) synonym lookup; fuzzy scoring only runs on misses
+_EXACT = _build_exact()
+
+
 def _load_aliases() -> Dict[str, str]:
     if ALIAS_STORE.exists():
         try:
@@ -118,6 +150,7 @@ def learn_alias(source_header: str, canonical: str) -> None:
     aliases = _load_aliases()
     aliases[source_header] = canonical
     _save_aliases(aliases)
+    _match_one.cache_clear()
 
 
 def map_headers(
@@ -134,71 +167,66 @@ def map_headers(
     mapping: Dict[str, str] = {}
     unmapped: list[str] = []
 
-    # Build candidate list for fuzzy search
-    candidates = set(CANONICAL)
-    for k, syns in SYNONYMS.items():
-        candidates.add(k)
-        candidates.update(syns)
-    candidates_list = list(candidates)
-
     for h in headers:
         h_stripped = h.strip()
         # learned alias?
         if h_stripped in aliases:
             mapping[h_stripped] = aliases[h_stripped]
             continue
-        # synonym exact/normalized
-        norm = _normalize(h_stripped)
-        found = False
-        for dest, syns in SYNONYMS.items():
-            if norm == _normalize(dest) or any(norm == _normalize(s) for s in syns):
-                mapping[h_stripped] = dest
-                found = True
-                break
-        if found:
-            continue
-        # fuzzy
-        best, score, _ = process.extractOne(
-            h_stripped, candidates_list, scorer=fuzz.WRatio
-        )
-        if score >= threshold:
-            # Map synonym hit back to its canonical key
-            dest = (
-                best
-                if best in CANONICAL
-                else next((k for k, v in SYNONYMS.items() if best in v), None)
-            )
-            if dest:
-                mapping[h_stripped] = dest
-                continue
-        unmapped.append(h_stripped)
+        dest = _match_one(h_stripped, threshold)
+        if dest:
+            mapping[h_stripped] = dest
+        else:
+            unmapped.append(h_stripped)
 
     # ensure we don't map multiple source headers to same canonical when avoidable
     # (leave as-is; later steps can add disambiguation UI)
     return mapping, unmapped
 
 
+@lru_cache(maxsize=4096)
+def _match_one(header: str, threshold: int) -> Optional[str]:
+    """
+    Synonym then fuzzy match for one stripped header (learned aliases excluded).
+
+    Pure in its arguments, so repeated headers across manifests are memoized.
+    """
+    # synonym exact/normalized: one dict probe
+    dest = _EXACT.get(_normalize(header))
+    if dest:
+        return dest
+
+    # fuzzy; score_cutoff lets RapidFuzz skip candidates early
+    match = process.extractOne(
+        header, _CANDIDATES, scorer=fuzz.WRatio, score_cutoff=threshold
+    )
+    if match is None:
+        return None
+    # Map synonym hit back to its canonical key
+    return _CANDIDATE_CANONICAL[match[0]]
+
+
 def suggest_candidates(src_header: str, top_k: int = 5) -> list[dict]:
     """
     Return top-k fuzzy candidates for a source header.
     Each item: {"candidate": str, "canonical": str|None, "score": int}
     """
-    # Build same candidate universe as map_headers
-    candidates = set(CANONICAL)
-    for k, syns in SYNONYMS.items():
-        candidates.add(k)
-        candidates.update(syns)
-    cand_list = list(candidates)
-
-    results = process.extract(src_header, cand_list, scorer=fuzz.WRatio, limit=top_k)
-    out = []
-    for cand, score, _ in results:
-        if cand in CANONICAL:
-            canonical = cand
-        else:
-            canonical = next((k for k, v in SYNONYMS.items() if cand in v), None)
-        out.append({"candidate": cand, "canonical": canonical, "score": int(score)})
-    return out
+    return [
+        {"candidate": cand, "canonical": canonical, "score": score}
+        for cand, canonical, score in _suggest_cached(src_header, top_k)
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _suggest_cached(
+    src_header: str, top_k: int
+) -> Tuple[Tuple[str, Optional[str], int], ...]:
+    # The candidate universe is static (aliases are not suggested), so repeat
+    # lookups while a user edits a mapping never need invalidating.
+    results = process.extract(src_header, _CANDIDATES, scorer=fuzz.WRatio, limit=top_k)
+    return tuple(
+        (cand, _CANDIDATE_CANONICAL[cand], int(score)) for cand, score, _ in results
+    )
 
 
 def find_conflicts(mapping: dict[str, str]) -> dict[str, list[str]]:
@@ -1,23 +1,47 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Input columns read by extract_ids (and output columns it produces)
+ID_COLUMNS = ("asin", "upc", "ean", "upc_ean_asin")
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
 
 
 def normalize_digits(s: Optional[str]) -> Optional[str]:
     """Extract digits from string, return None if no digits found."""
     if not isinstance(s, str):
         return None
-    d = re.sub(r"[^0-9]", "", s)
+    # Clean IDs (the common case) need no regex pass
+    if s.isascii() and s.isdigit():
+        return s
+    d = _NON_DIGIT_RE.sub("", s)
     return d or None
 
 
+# Shape predicates for already-normalized IDs; plain length/str checks are
+# cheaper than regex matching for these fixed-width formats.
+def _is_asin(s: str) -> bool:
+    return len(s) == 10 and s.isalnum()
+
+
+def _is_upc(digits: str) -> bool:
+    return len(digits) == 12 and validate_upc_check_digit(digits)
+
+
+def _is_ean(digits: str) -> bool:
+    return len(digits) == 13
+
+
 def normalize_asin(s: Optional[str]) -> Optional[str]:
     """Normalize ASIN to uppercase, validate 10-char alphanumeric format."""
     if not isinstance(s, str):
         return None
     t = s.strip().upper()
-    return t if (len(t) == 10 and t.isalnum()) else None
+    return t if _is_asin(t) else None
 
 
 def validate_upc_check_digit(upc: str) -> bool:
@@ -32,19 +56,59 @@ def validate_upc_check_digit(upc: str) -> bool:
     """
     if not isinstance(upc, str) or len(upc) != 12 or not upc.isdigit():
         return False
+    if not upc.isascii():
+        # Other Unicode decimal digits: map to their ASCII values first
+        upc = "".join(str(int(c)) for c in upc)
+
+    # Unrolled UPC-A sum over the raw ASCII codes: odd positions (indices
+    # 0,2,...,10) weigh 3, even positions (1,3,...,9) weigh 1. Each code is
+    # its digit + 48, so the 3*6 + 5 = 23 weighted offsets total 1104.
+    b = upc.encode("ascii")
+    total = (
+        3 * (b[0] + b[2] + b[4] + b[6] + b[8] + b[10])
+        + (b[1] + b[3] + b[5] + b[7] + b[9])
+        - 1104
+    )
 
-    # Calculate check digit using UPC-A algorithm
-    # Odd positions (1st, 3rd, 5th, 7th, 9th, 11th) - indices 0,2,4,6,8,10
-    odd_sum = sum(int(upc[i]) for i in [0, 2, 4, 6, 8, 10])
+    # Compare expected check digit with the 12th digit
+    return (10 - total % 10) % 10 == b[11] - 48
 
-    # Even positions (2nd, 4th, 6th, 8th, 10th) - indices 1,3,5,7,9
-    even_sum = sum(int(upc[i]) for i in [1, 3, 5, 7, 9])
 
-    # Calculate expected check digit
-    check = (10 - ((odd_sum * 3 + even_sum) % 10)) % 10
+# UPC-A weights for the 11 payload digits (odd positions x3, even x1)
+_UPC_WEIGHTS = np.array([3, 1] * 5 + [3], dtype=np.int64)
 
-    # Compare with actual check digit (12th digit, index 11)
-    return int(upc[11]) == check
+
+def validate_upc_check_digit_batch(upcs: Iterable[Any]) -> np.ndarray:
+    """
+    Vectorized validate_upc_check_digit over many candidate UPCs at once.
+
+    Well-formed entries are packed into an (N, 12) uint8 digit matrix and
+    checked with one weighted sum per row, with no per-digit Python work.
+
+    Args:
+        upcs: Candidate values; anything but a 12-digit string is invalid
+
+    Returns:
+        Boolean array with one entry per input value
+    """
+    values = list(upcs)
+    out = np.zeros(len(values), dtype=bool)
+    rows = []
+    packed = []
+    for i, v in enumerate(values):
+        if isinstance(v, str) and len(v) == 12 and v.isdigit():
+            if v.isascii():
+                rows.append(i)
+                packed.append(v)
+            else:
+                # Non-ASCII digits (e.g. Arabic-Indic) keep scalar semantics
+                out[i] = validate_upc_check_digit(v)
+    if packed:
+        raw = "".join(packed).encode("ascii")
+        d = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 12).astype(np.int64) - 48
+        check = (10 - (d[:, :11] @ _UPC_WEIGHTS) % 10) % 10
+        out[rows] = check == d[:, 11]
+    return out
 
 
 def extract_ids(item: Dict) -> Dict[str, Optional[str]]:
@@ -84,10 +148,9 @@ def extract_ids(item: Dict) -> Dict[str, Optional[str]]:
             if canonical_digits:
                 result_canonical = canonical_digits
                 # Classify by digit count with UPC validation
-                if len(canonical_digits) == 12:
-                    if validate_upc_check_digit(canonical_digits):
-                        result_upc = canonical_digits
-                elif len(canonical_digits) == 13:
+                if _is_upc(canonical_digits):
+                    result_upc = canonical_digits
+                elif _is_ean(canonical_digits):
                     result_ean = canonical_digits
 
     # If no upc_ean_asin, process separate fields with upc > ean precedence
@@ -96,11 +159,7 @@ def extract_ids(item: Dict) -> Dict[str, Optional[str]]:
         upc_raw = item.get("upc", "")
         if upc_raw:
             upc_digits = normalize_digits(upc_raw)
-            if (
-                upc_digits
-                and len(upc_digits) == 12
-                and validate_upc_check_digit(upc_digits)
-            ):
+            if upc_digits and _is_upc(upc_digits):
                 result_upc = upc_digits
                 result_canonical = upc_digits
 
@@ -109,7 +168,7 @@ def extract_ids(item: Dict) -> Dict[str, Optional[str]]:
             ean_raw = item.get("ean", "")
             if ean_raw:
                 ean_digits = normalize_digits(ean_raw)
-                if ean_digits and len(ean_digits) == 13:
+                if ean_digits and _is_ean(ean_digits):
                     result_ean = ean_digits
                     result_canonical = ean_digits
 
@@ -119,3 +178,78 @@ def extract_ids(item: Dict) -> Dict[str, Optional[str]]:
         "ean": result_ean,
         "upc_ean_asin": result_canonical,
     }
+
+
+def _normalize_asin_column(values: pd.Series) -> pd.Series:
+    """Column-wise normalize_asin(): upper-cased 10-char alphanumerics, else NaN."""
+    t = values.str.strip().str.upper()
+    valid = (t.str.len() == 10) & t.str.isalnum().eq(True)
+    return t.where(valid)
+
+
+def _normalize_digits_column(values: pd.Series) -> pd.Series:
+    """Column-wise normalize_digits(): digit-only strings, NaN when empty."""
+    d = values.str.replace(_NON_DIGIT_RE, "", regex=True)
+    return d.where(d.str.len() > 0)
+
+
+def _valid_upc_mask(digits: pd.Series) -> pd.Series:
+    """Column-wise validate_upc_check_digit() over normalized digit strings."""
+    return pd.Series(
+        validate_upc_check_digit_batch(digits.tolist()), index=digits.index
+    )
+
+
+def extract_ids_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized extract_ids() over every row of a DataFrame.
+
+    Mirrors the per-item precedence exactly: upc_ean_asin first (ASIN, then
+    digits classified by length), otherwise upc > ean. Non-string values are
+    dropped up front, as the scalar normalizers ignore them.
+
+    Args:
+        df: Frame with any of the asin/upc/ean/upc_ean_asin columns
+
+    Returns:
+        Frame indexed like df with asin/upc/ean/upc_ean_asin columns holding
+        normalized strings or None
+    """
+
+    def column(key: str) -> pd.Series:
+        if key not in df.columns:
+            return pd.Series(None, index=range(len(df)), dtype=object)
+        values = df[key]
+        if isinstance(values, pd.DataFrame):
+            # Duplicate headers: dict(row) keeps the last one
+            values = values.iloc[:, -1]
+        return pd.Series(
+            [v if isinstance(v, str) else None for v in values.tolist()],
+            dtype=object,
+        )
+
+    asin = _normalize_asin_column(column("asin"))
+
+    raw = column("upc_ean_asin")
+    canon_asin = _normalize_asin_column(raw)
+    canon_digits = _normalize_digits_column(raw).where(canon_asin.isna())
+    canonical = canon_asin.where(canon_asin.notna(), canon_digits)
+    upc = canon_digits.where(_valid_upc_mask(canon_digits))
+    ean = canon_digits.where(canon_digits.str.len() == 13)
+
+    # Separate fields only when upc_ean_asin yielded nothing (upc > ean)
+    missing = canonical.isna()
+    upc_digits = _normalize_digits_column(column("upc").where(missing))
+    upc_ok = missing & _valid_upc_mask(upc_digits)
+    upc = upc.where(~upc_ok, upc_digits)
+    ean_digits = _normalize_digits_column(column("ean").where(missing))
+    ean_ok = missing & ~upc_ok & (ean_digits.str.len() == 13)
+    ean = ean.where(~ean_ok, ean_digits)
+    canonical = canonical.where(~upc_ok, upc_digits).where(~ean_ok, ean_digits)
+
+    ids = pd.DataFrame(
+        {"asin": asin, "upc": upc, "ean": ean, "upc_ean_asin": canonical}
+    ).astype(object)
+    ids = ids.where(ids.notna(), None)
+    ids.index = df.index
+    return ids
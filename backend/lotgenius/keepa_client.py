@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import random
 import sqlite3
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .cache_db import ThreadLocalConnections
 from .cache_metrics import (
     record_cache_eviction,
     record_cache_hit,
@@ -20,63 +27,200 @@ from .cache_metrics import (
 )
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Simple file cache (sqlite) with TTL
 _DB_PATH = Path("data/cache/keepa_cache.sqlite")
 _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 _lock = threading.Lock()
+# Stay well under SQLite's host-parameter limit in IN (...) lookups
+_SQL_VARS_PER_QUERY = 500
+# Keepa's /product endpoint accepts up to 100 comma-separated codes
+_MAX_CODES_PER_REQUEST = 100
+# Expired rows stay servable (and are kept on disk) until this many TTLs old
+_STALE_TTL_FACTOR = 2
+# Pooled HTTPS connections per client (requests defaults to 10)
+_HTTP_POOL_SIZE = 32
 
 
-def _db():
-    conn = sqlite3.connect(_DB_PATH, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA busy_timeout=5000;")
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create the cache table and index, migrating rowid tables."""
+    # WITHOUT ROWID stores rows in the primary-key b-tree itself, so a lookup
+    # by k is one b-tree search instead of index search + rowid fetch
     conn.execute(
         """CREATE TABLE IF NOT EXISTS cache (
         k TEXT PRIMARY KEY,
-        v TEXT NOT NULL,
+        v BLOB NOT NULL,
         ts INTEGER NOT NULL
-    )"""
+    ) WITHOUT ROWID"""
     )
+    try:
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'cache'"
+        ).fetchone()
+        if row and "WITHOUT ROWID" not in str(row[0]).upper():
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache_new (
+                k TEXT PRIMARY KEY,
+                v BLOB NOT NULL,
+                ts INTEGER NOT NULL
+            ) WITHOUT ROWID"""
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_new (k, v, ts) SELECT k, v, ts FROM cache"
+            )
+            conn.execute("DROP TABLE cache")
+            conn.execute("ALTER TABLE cache_new RENAME TO cache")
+    except Exception:
+        # If migration fails, leave as-is; the rowid table still works
+        pass
     # Add index on timestamp for efficient TTL scanning
     conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_ts ON cache(ts);")
-    return conn
+    conn.commit()
 
 
-def _cache_get(key: str, ttl_sec: int) -> Optional[dict]:
+# A 16 MiB page cache and mmap keep hot lookups off the read() path
+_conns = ThreadLocalConnections(
+    _init_schema, pragmas=("PRAGMA cache_size=-16384;", "PRAGMA mmap_size=268435456;")
+)
+
+
+def _db() -> sqlite3.Connection:
+    """Return this thread's cache connection, reopening if _DB_PATH changed."""
+    return _conns.get(_DB_PATH)
+
+
+def _encode_payload(payload: dict) -> bytes | str:
+    """Serialize a payload for storage, as orjson bytes when installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            # e.g. non-str keys or ints beyond 64 bits; stdlib json copes
+            pass
+    return json.dumps(payload)
+
+
+def _decode_payload(value: bytes | str) -> dict:
+    """Deserialize a stored payload; both decoders read JSON text or bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def _cache_get_entry(key: str, ttl_sec: int) -> Optional[Tuple[dict, int]]:
+    """Fresh (payload, stored_at) for key, else None."""
     with _lock:
         conn = _db()
         cur = conn.execute("SELECT v, ts FROM cache WHERE k = ?", (key,))
         row = cur.fetchone()
-        conn.close()
     if not row:
         record_cache_miss("keepa")
         return None
     v, ts = row
     if int(time.time()) - ts > ttl_sec:
         record_cache_miss("keepa")
-        # Optional: Clean up expired entries
-        _cleanup_expired(key, ttl_sec)
+        # Optional: Clean up expired entries, keeping the stale window
+        _cleanup_expired(key, ttl_sec * _STALE_TTL_FACTOR)
         return None
     record_cache_hit("keepa")
     try:
-        return json.loads(v)
+        return _decode_payload(v), ts
     except Exception:
         record_cache_miss("keepa")
         return None
 
 
+def _cache_get(key: str, ttl_sec: int) -> Optional[dict]:
+    entry = _cache_get_entry(key, ttl_sec)
+    return entry[0] if entry is not None else None
+
+
+def _cache_get_stale(key: str, ttl_sec: int) -> Optional[dict]:
+    """Entry past its TTL but still inside the stale window, else None."""
+    with _lock:
+        conn = _db()
+        row = conn.execute("SELECT v, ts FROM cache WHERE k = ?", (key,)).fetchone()
+    if not row:
+        return None
+    v, ts = row
+    if int(time.time()) - ts > ttl_sec * _STALE_TTL_FACTOR:
+        return None
+    try:
+        return _decode_payload(v)
+    except Exception:
+        return None
+
+
 def _cache_set(key: str, payload: dict):
     with _lock:
         conn = _db()
         conn.execute(
             "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
-            (key, json.dumps(payload), int(time.time())),
+            (key, _encode_payload(payload), int(time.time())),
         )
         conn.commit()
-        conn.close()
     record_cache_store("keepa")
 
 
+def _cache_get_many(keys: List[str], ttl_sec: int) -> Dict[str, Tuple[dict, int]]:
+    """Fetch many fresh (payload, stored_at) entries, one query per key chunk."""
+    rows: List[Tuple[str, str, int]] = []
+    with _lock:
+        conn = _db()
+        for i in range(0, len(keys), _SQL_VARS_PER_QUERY):
+            chunk = keys[i : i + _SQL_VARS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                conn.execute(
+                    f"SELECT k, v, ts FROM cache WHERE k IN ({placeholders})", chunk
+                ).fetchall()
+            )
+
+    now = int(time.time())
+    found: Dict[str, Tuple[dict, int]] = {}
+    expired = False
+    for k, v, ts in rows:
+        if now - ts > ttl_sec:
+            expired = True
+            continue
+        try:
+            found[k] = (_decode_payload(v), ts)
+        except Exception:
+            continue
+    for key in keys:
+        if key in found:
+            record_cache_hit("keepa")
+        else:
+            record_cache_miss("keepa")
+    if expired:
+        _cleanup_expired(keys[0], ttl_sec * _STALE_TTL_FACTOR)
+    return found
+
+
+def _cache_set_many(entries: List[Tuple[str, dict]]) -> None:
+    """Store many payloads in one transaction."""
+    if not entries:
+        return
+    now = int(time.time())
+    with _lock:
+        conn = _db()
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
+            [(key, _encode_payload(payload), now) for key, payload in entries],
+        )
+        conn.commit()
+    for _ in entries:
+        record_cache_store("keepa")
+
+
 def _cleanup_expired(current_key: str, ttl_sec: int) -> None:
     """Clean up expired cache entries."""
     try:
@@ -86,7 +230,6 @@ def _cleanup_expired(current_key: str, ttl_sec: int) -> None:
             cursor = conn.execute("DELETE FROM cache WHERE ts < ?", (cutoff_time,))
             evicted_count = cursor.rowcount
             conn.commit()
-            conn.close()
             if evicted_count > 0:
                 # Record evictions for the cleaned up entries
                 for _ in range(evicted_count):
@@ -95,6 +238,34 @@ def _cleanup_expired(current_key: str, ttl_sec: int) -> None:
         pass  # Ignore cleanup errors
 
 
+def _normalize_code(code: Any) -> str:
+    """
+    Canonical form of a UPC/EAN code for cache keys and requests.
+    Whitespace is stripped; 11-14 digit codes are reduced to UPC-A when
+    they only differ by leading zeros (12345678905, 012345678905 and
+    0012345678905 all map to 012345678905), otherwise to EAN-13. A
+    GTIN-14 with a non-zero indicator digit passes through unchanged, as
+    does anything else (ASINs, short codes) apart from the strip.
+    """
+    code = str(code).strip()
+    if 11 <= len(code) <= 14 and code.isdigit():
+        digits = code.lstrip("0")
+        return digits.zfill(12 if len(digits) <= 12 else 13)
+    return code
+
+
+def _parse_json(resp: Any) -> Any:
+    """Decode a response body, with orjson when available."""
+    content = getattr(resp, "content", None)
+    if HAS_ORJSON and isinstance(content, (bytes, bytearray)):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Non-UTF-8 or invalid bodies: let requests decode or raise
+            pass
+    return resp.json()
+
+
 @dataclass
 class KeepaConfig:
     api_key: str
@@ -105,6 +276,11 @@ class KeepaConfig:
     backoff_initial: float = 0.7
     backoff_max: float = 8.0
     max_retries: int = 3
+    mem_cache_size: int = 1024  # per-client in-memory entries; 0 disables
+    # Serve entries up to one extra TTL old while refreshing in the background
+    serve_stale: bool = True
+    # Upper bound close(wait=True) spends letting queued refreshes finish
+    refresh_wait_sec: float = 30.0
 
 
 class KeepaClient:
@@ -122,65 +298,201 @@ class KeepaClient:
             )
         self.cfg = cfg
         self.session = requests.Session()
+        # Keep enough warm keep-alive connections for concurrent lookups;
+        # retries are handled in _request, not by urllib3
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=_HTTP_POOL_SIZE,
+                pool_maxsize=_HTTP_POOL_SIZE,
+                max_retries=0,
+            ),
+        )
+        # In-memory front for the SQLite cache: cache_key -> (payload, stored_at).
+        # stored_at is the SQLite row's timestamp, so both layers expire together.
+        # Payloads are shared between hits, so callers must treat them as
+        # read-only (resolve only extracts fields from them).
+        self._mem_cache: OrderedDict[str, Tuple[dict, float]] = OrderedDict()
+        # Background refreshes for stale-while-revalidate, one per cache key
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._refreshing: set[str] = set()
+        self._refresh_futures: set[Future] = set()
+        self._refresh_lock = threading.Lock()
 
         # Eager DB init to ensure file exists and PRAGMAs are applied
         try:
-            conn = _db()
-            conn.close()
+            _db()
         except Exception:
             pass
 
-    def _get(self, url: str, params: dict, cache_key: str) -> dict:
+    def _mem_get(self, cache_key: str, ttl: int) -> Optional[dict]:
+        entry = self._mem_cache.get(cache_key)
+        if entry is None:
+            return None
+        payload, stored_at = entry
+        if time.time() - stored_at > ttl:
+            del self._mem_cache[cache_key]
+            return None
+        self._mem_cache.move_to_end(cache_key)
+        record_cache_hit("keepa")
+        return payload
+
+    def _mem_put(
+        self, cache_key: str, payload: dict, stored_at: Optional[float] = None
+    ) -> None:
+        if self.cfg.mem_cache_size <= 0:
+            return
+        if stored_at is None:
+            stored_at = time.time()
+        self._mem_cache[cache_key] = (payload, stored_at)
+        self._mem_cache.move_to_end(cache_key)
+        if len(self._mem_cache) > self.cfg.mem_cache_size:
+            self._mem_cache.popitem(last=False)
+
+    def _ttl(self) -> int:
         # Use ttl_sec override if provided, otherwise use ttl_days
-        ttl = (
+        return (
             self.cfg.ttl_sec
             if self.cfg.ttl_sec is not None
             else int(self.cfg.ttl_days * 86400)
         )
-        cached = _cache_get(cache_key, ttl)
+
+    def _get(self, url: str, params: dict, cache_key: str) -> dict:
+        ttl = self._ttl()
+        cached = self._mem_get(cache_key, ttl)
+        if cached is None:
+            entry = _cache_get_entry(cache_key, ttl)
+            if entry is not None:
+                cached, stored_at = entry
+                self._mem_put(cache_key, cached, stored_at)
         if cached is not None:
-            result = {"ok": True, "cached": True, "data": cached}
-            if should_emit_metrics():
-                from .cache_metrics import get_cache_stats
+            return self._with_stats({"ok": True, "cached": True, "data": cached})
+
+        if self.cfg.serve_stale:
+            stale = _cache_get_stale(cache_key, ttl)
+            if stale is not None:
+                self._schedule_refresh(url, params, cache_key)
+                return self._with_stats(
+                    {"ok": True, "cached": True, "stale": True, "data": stale}
+                )
+
+        result = self._request(url, params)
+        if result["ok"]:
+            _cache_set(cache_key, result["data"])
+            self._mem_put(cache_key, result["data"])
+            result = self._with_stats(result)
+        return result
+
+    def _schedule_refresh(self, url: str, params: dict, cache_key: str) -> None:
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="keepa-refresh"
+                )
+            pool = self._refresh_pool
+        future = pool.submit(self._refresh, url, params, cache_key)
+        with self._refresh_lock:
+            self._refresh_futures.add(future)
+        future.add_done_callback(self._refresh_done)
 
-                result["cache_stats"] = get_cache_stats("keepa")
-            return result
+    def _refresh_done(self, future: Future) -> None:
+        with self._refresh_lock:
+            self._refresh_futures.discard(future)
+
+    def _refresh(self, url: str, params: dict, cache_key: str) -> None:
+        # The stale payload was never put in the memory cache, so the next
+        # lookup after this write reads the fresh row from SQLite
+        # A failed refresh leaves the stale row for the next attempt
+        try:
+            result = self._request(url, params)
+            if result["ok"]:
+                _cache_set(cache_key, result["data"])
+            else:
+                logger.debug("Keepa refresh failed for %s: %s", cache_key, result)
+        except Exception:
+            logger.debug("Keepa refresh failed for %s", cache_key, exc_info=True)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
 
-        # retry with backoff
-        delay = self.cfg.backoff_initial
+    def close(self, wait: bool = False) -> None:
+        """
+        Stop the refresh pool and release pooled connections. With wait=True,
+        queued refreshes get up to cfg.refresh_wait_sec to finish first;
+        anything still pending after that is cancelled.
+        """
+        with self._refresh_lock:
+            pool, self._refresh_pool = self._refresh_pool, None
+            pending = list(self._refresh_futures)
+        if pool is not None:
+            if wait and pending:
+                wait_futures(pending, timeout=self.cfg.refresh_wait_sec)
+            pool.shutdown(wait=False, cancel_futures=True)
+        with self._refresh_lock:
+            self._refreshing.clear()
+        self.session.close()
+
+    def __enter__(self) -> "KeepaClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _request(self, url: str, params: dict) -> dict:
+        """GET with retry/backoff; {'ok': True, 'cached': False, 'data': ...} on 200."""
         for attempt in range(self.cfg.max_retries):
+            resp = None
             try:
                 resp = self.session.get(
                     url, params=params, timeout=self.cfg.timeout_sec
                 )
                 if resp.status_code == 200:
-                    data = resp.json()
-                    _cache_set(cache_key, data)
-                    result = {"ok": True, "cached": False, "data": data}
-                    if should_emit_metrics():
-                        from .cache_metrics import get_cache_stats
-
-                        result["cache_stats"] = get_cache_stats("keepa")
-                    return result
-                # throttle/429 or temporary server errors → backoff
-                if resp.status_code in (429, 502, 503, 504):
-                    time.sleep(delay)
-                    delay = min(self.cfg.backoff_max, delay * 2)
-                    continue
-                # hard error
-                return {"ok": False, "status": resp.status_code, "error": resp.text}
+                    return {"ok": True, "cached": False, "data": _parse_json(resp)}
+                # hard error; throttle/429 or temporary server errors → backoff
+                if resp.status_code not in (429, 502, 503, 504):
+                    return {"ok": False, "status": resp.status_code, "error": resp.text}
             except requests.RequestException:
-                time.sleep(delay)
-                delay = min(self.cfg.backoff_max, delay * 2)
+                pass
+            if attempt + 1 < self.cfg.max_retries:
+                time.sleep(self._backoff_delay(attempt, resp))
         return {"ok": False, "error": "request failed after retries"}
 
+    def _backoff_delay(self, attempt: int, resp: Any = None) -> float:
+        """
+        Server's Retry-After seconds if given (capped at backoff_max so a long
+        value cannot stall callers), else jittered exponential backoff.
+        """
+        headers = getattr(resp, "headers", None) or {}
+        try:
+            retry_after = float(headers.get("Retry-After"))
+            if retry_after >= 0:
+                return min(retry_after, self.cfg.backoff_max)
+        except (TypeError, ValueError):
+            pass
+        # Jitter keeps concurrent workers from retrying in lockstep
+        base = self.cfg.backoff_initial
+        return min(self.cfg.backoff_max, base * 2**attempt) + random.uniform(0, base)
+
+    @staticmethod
+    def _with_stats(result: dict) -> dict:
+        if should_emit_metrics():
+            from .cache_metrics import get_cache_stats
+
+            result["cache_stats"] = get_cache_stats("keepa")
+        return result
+
     def lookup_by_code(self, code: str) -> dict:
         """
         Resolves UPC/EAN/ASIN via Keepa /product endpoint.
-        Returns {'ok':bool, 'cached':bool, 'data':raw_json or None}
+        Returns {'ok':bool, 'cached':bool, 'data':raw_json or None}, plus
+        'stale': True when an expired entry is served while it refreshes.
         """
         if not self.cfg.api_key:
             return {"ok": False, "error": "KEEPA_API_KEY not set"}
+        code = _normalize_code(code)
         url = "https://api.keepa.com/product"
         params = {
             "key": self.cfg.api_key,
@@ -188,7 +500,71 @@ class KeepaClient:
             "code": code,
             "stats": 0,  # lighter payload; we just need ASIN and basic meta in this step
         }
-        return self._get(url, params, cache_key=f"product:{self.cfg.domain}:{code}")
+        return self._get(url, params, cache_key=self._code_cache_key(code))
+
+    def _code_cache_key(self, code: str) -> str:
+        return f"product:{self.cfg.domain}:{code}"
+
+    def lookup_by_codes(self, codes: Iterable[str]) -> Dict[str, dict]:
+        """
+        Batched lookup_by_code for many UPC/EAN/ASIN codes.
+        Cached codes are read in one SQLite query; misses are fetched in
+        requests of up to 100 codes. Returns {code: result}, each result
+        shaped like lookup_by_code's; equivalent UPC/EAN forms share one
+        lookup.
+        """
+        requested = list(dict.fromkeys(codes))
+        if not self.cfg.api_key:
+            return {
+                c: {"ok": False, "error": "KEEPA_API_KEY not set"} for c in requested
+            }
+        canonical = {c: _normalize_code(c) for c in requested}
+        unique = list(dict.fromkeys(canonical.values()))
+
+        ttl = self._ttl()
+        results: Dict[str, dict] = {}
+        misses: List[str] = []
+        for code in unique:
+            cached = self._mem_get(self._code_cache_key(code), ttl)
+            if cached is not None:
+                results[code] = {"ok": True, "cached": True, "data": cached}
+            else:
+                misses.append(code)
+
+        stored = _cache_get_many([self._code_cache_key(c) for c in misses], ttl)
+        uncached: List[str] = []
+        for code in misses:
+            entry = stored.get(self._code_cache_key(code))
+            if entry is not None:
+                cached, stored_at = entry
+                self._mem_put(self._code_cache_key(code), cached, stored_at)
+                results[code] = {"ok": True, "cached": True, "data": cached}
+            else:
+                uncached.append(code)
+
+        url = "https://api.keepa.com/product"
+        for i in range(0, len(uncached), _MAX_CODES_PER_REQUEST):
+            chunk = uncached[i : i + _MAX_CODES_PER_REQUEST]
+            params = {
+                "key": self.cfg.api_key,
+                "domain": self.cfg.domain,
+                "code": ",".join(chunk),
+                "stats": 0,
+            }
+            result = self._request(url, params)
+            if not result["ok"]:
+                for code in chunk:
+                    results[code] = dict(result)
+                continue
+            per_code = _split_products_by_code(result["data"], chunk)
+            _cache_set_many([(self._code_cache_key(c), per_code[c]) for c in chunk])
+            for code in chunk:
+                self._mem_put(self._code_cache_key(code), per_code[code])
+                results[code] = {"ok": True, "cached": False, "data": per_code[code]}
+
+        return {
+            code: self._with_stats(dict(results[canonical[code]])) for code in requested
+        }
 
     def search_by_title(self, query: str) -> dict:
         """
@@ -206,6 +582,7 @@ class KeepaClient:
         """Get Keepa product payload with stats=1 using UPC/EAN code."""
         if not self.cfg.api_key:
             return {"ok": False, "error": "KEEPA_API_KEY not set"}
+        code = _normalize_code(code)
         url = "https://api.keepa.com/product"
         params = {
             "key": self.cfg.api_key,
@@ -233,13 +610,38 @@ class KeepaClient:
         )
 
 
+def _split_products_by_code(payload: dict, codes: List[str]) -> Dict[str, dict]:
+    """
+    Split a multi-code /product response into one payload per requested code.
+    Products are matched through their upcList/eanList/asin identifiers
+    (ignoring leading zeros, so UPC-A and its EAN-13 form agree).
+    """
+    if len(codes) == 1:
+        return {codes[0]: payload}
+    meta = {k: v for k, v in payload.items() if k != "products"}
+    wanted: Dict[str, List[str]] = {}
+    for code in codes:
+        wanted.setdefault(code.lstrip("0"), []).append(code)
+
+    by_code: Dict[str, list] = {code: [] for code in codes}
+    for product in payload.get("products") or []:
+        identifiers = [
+            *(product.get("upcList") or []),
+            *(product.get("eanList") or []),
+            product.get("asin"),
+        ]
+        matched: Dict[str, None] = {}
+        for ident in identifiers:
+            if ident is None:
+                continue
+            for code in wanted.get(str(ident).lstrip("0"), ()):
+                matched[code] = None
+        for code in matched:
+            by_code[code].append(product)
+    return {code: {**meta, "products": products} for code, products in by_code.items()}
+
+
 def extract_primary_asin(keepa_payload: dict) -> Optional[str]:
-    try:
-        products = keepa_payload.get("products") or []
-        if not products:
-            return None
-        # pick the first product's ASIN
-        asin = products[0].get("asin")
-        return asin
-    except Exception:
-        return None
+    # pick the first product's ASIN
+    products = (keepa_payload or {}).get("products")
+    return products[0].get("asin") if products else None
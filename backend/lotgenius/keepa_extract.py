@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 def _num(x):
+    # Plain numbers (the Keepa norm) skip the exception machinery
+    if isinstance(x, (int, float)):
+        return float(x)
     try:
         return float(x)
     except Exception:
@@ -69,6 +72,26 @@ def _maybe_cents_to_unit(
     return a, b, scaled, rule
 
 
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        "price_new_median": None,
+        "price_used_median": None,
+        "salesrank_median": None,
+        "offers_count": None,
+        "scaled_from_cents": False,
+        "scale_rule": None,
+    }
+
+
+def _payload_products(keepa_payload: Optional[Dict[str, Any]]) -> List[Any]:
+    try:
+        products = (keepa_payload or {}).get("data", {}).get("products") or []
+        # Malformed non-list payloads only ever contributed their first item
+        return products if isinstance(products, list) else [products[0]]
+    except Exception:
+        return []
+
+
 def extract_stats_compact(keepa_payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Returns a compact, serializable dict of price/rank/offer stats.
@@ -79,20 +102,25 @@ def extract_stats_compact(keepa_payload: Dict[str, Any]) -> Dict[str, Any]:
       - scaled_from_cents (bool)
       - scale_rule (str|None) - description of scaling applied, if any
     """
-    out = {
-        "price_new_median": None,
-        "price_used_median": None,
-        "salesrank_median": None,
-        "offers_count": None,
-        "scaled_from_cents": False,
-        "scale_rule": None,
-    }
+    # Navigate to first product in response
+    products = _payload_products(keepa_payload)
+    if not products:
+        return _empty_stats()
+    return _compact_product(products[0])
+
+
+def extract_stats_compact_many(keepa_payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    extract_stats_compact for every product in a (batched) Keepa response,
+    in response order. Returns [] when the payload has no products.
+    """
+    return [_compact_product(p) for p in _payload_products(keepa_payload)]
+
+
+def _compact_product(product: Any) -> Dict[str, Any]:
+    out = _empty_stats()
     try:
-        # Navigate to first product in response
-        products = (keepa_payload or {}).get("data", {}).get("products") or []
-        if not products:
-            return out
-        p0 = products[0] or {}
+        p0 = product or {}
         stats = p0.get("stats") or {}
 
         # Extract pricing data from multiple sources for robustness
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import asdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .. import config as _config
 from ..datasources import smart_scrapers
@@ -9,6 +10,24 @@ from ..datasources.base import SoldComp
 from ..evidence import write_evidence  # real ledger
 from ..ids import extract_ids
 
+# Scraper entry points by source, resolved once at import. Tests can swap
+# entries with monkeypatch.setitem instead of patching sys.modules.
+_SCRAPERS: Dict[str, Callable[..., List[SoldComp]]] = {
+    "ebay": smart_scrapers.smart_ebay_scraper,
+    "google_search": smart_scrapers.smart_google_scraper,
+    "facebook": smart_scrapers.smart_facebook_scraper,
+}
+
+# Summary bucket for each comp source name (mock sources count with the real one)
+_SOURCE_BUCKETS = {
+    "ebay": "ebay",
+    "ebay_mock": "ebay",
+    "google_search": "google_search",
+    "google_mock": "google_search",
+    "facebook_marketplace": "facebook",
+    "facebook_mock": "facebook",
+}
+
 
 def gather_external_sold_comps(item: Dict[str, Any]) -> List[SoldComp]:
     title = item.get("title") or ""
@@ -21,34 +40,39 @@ def gather_external_sold_comps(item: Dict[str, Any]) -> List[SoldComp]:
     comps: List[SoldComp] = []
     errors: Dict[str, str] = {}
 
+    # Read settings once per item rather than per scraper call
+    settings = _config.settings
+    max_results = settings.EXTERNAL_COMPS_MAX_RESULTS
+    tos_ack = settings.SCRAPER_TOS_ACK
+
     # Try eBay scraper if enabled
-    if _config.settings.ENABLE_EBAY_SCRAPER and _config.settings.SCRAPER_TOS_ACK:
+    if settings.ENABLE_EBAY_SCRAPER and tos_ack:
         try:
-            ebay_comps = smart_scrapers.smart_ebay_scraper(
+            ebay_comps = _SCRAPERS["ebay"](
                 query=title,
                 brand=brand,
                 model=model,
                 upc=upc,
                 asin=asin,
                 condition_hint=cond,
-                max_results=_config.settings.EXTERNAL_COMPS_MAX_RESULTS,
-                days_lookback=_config.settings.EXTERNAL_COMPS_LOOKBACK_DAYS,
+                max_results=max_results,
+                days_lookback=settings.EXTERNAL_COMPS_LOOKBACK_DAYS,
             )
             comps.extend(ebay_comps)
         except Exception as e:
             errors["ebay"] = str(e)
 
     # Try Google Search if enabled
-    if _config.settings.ENABLE_GOOGLE_SEARCH_ENRICHMENT:
+    if settings.ENABLE_GOOGLE_SEARCH_ENRICHMENT:
         try:
-            google_comps = smart_scrapers.smart_google_scraper(
+            google_comps = _SCRAPERS["google_search"](
                 query=title,
                 brand=brand,
                 model=model,
                 upc=upc,
                 asin=asin,
                 condition_hint=cond,
-                max_results=_config.settings.EXTERNAL_COMPS_MAX_RESULTS,
+                max_results=max_results,
             )
             comps.extend(google_comps)
         except ImportError as e:
@@ -57,34 +81,28 @@ def gather_external_sold_comps(item: Dict[str, Any]) -> List[SoldComp]:
             errors["google_search"] = str(e)
 
     # Try Facebook Marketplace if enabled
-    if _config.settings.ENABLE_FB_SCRAPER and _config.settings.SCRAPER_TOS_ACK:
+    if settings.ENABLE_FB_SCRAPER and tos_ack:
         try:
-            facebook_comps = smart_scrapers.smart_facebook_scraper(
+            facebook_comps = _SCRAPERS["facebook"](
                 query=title,
                 brand=brand,
                 model=model,
                 upc=upc,
                 asin=asin,
                 condition_hint=cond,
-                max_results=_config.settings.EXTERNAL_COMPS_MAX_RESULTS,
+                max_results=max_results,
             )
             comps.extend(facebook_comps)
         except Exception as e:
             errors["facebook"] = str(e)
 
     # Write single consolidated evidence record
+    source_counts = Counter(_SOURCE_BUCKETS.get(c.source) for c in comps)
     evidence_meta = {
         "num_comps": len(comps),
         "by_source": {
-            "ebay": sum(1 for c in comps if c.source in ["ebay", "ebay_mock"]),
-            "google_search": sum(
-                1 for c in comps if c.source in ["google_search", "google_mock"]
-            ),
-            "facebook": sum(
-                1
-                for c in comps
-                if c.source in ["facebook_marketplace", "facebook_mock"]
-            ),
+            bucket: source_counts[bucket]
+            for bucket in ("ebay", "google_search", "facebook")
         },
         "sample": [asdict(c) for c in comps[:8]],
     }
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import gzip
 import json
+import math
 import re
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from .ids import normalize_asin, validate_upc_check_digit
@@ -15,6 +17,19 @@ from .keepa_client import KeepaClient, extract_primary_asin
 from .keepa_extract import extract_stats_compact
 from .parse import parse_and_clean
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_ORJSON_OPTS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    if HAS_ORJSON
+    else 0
+)
+
 
 @dataclass
 class EvidenceRecord:
@@ -56,6 +71,17 @@ def resolve_ids(
     df["match_score"] = None
 
     client = KeepaClient()
+    try:
+        ledger = _resolve_rows(df, client, use_network)
+    finally:
+        client.close(wait=True)
+    return df, ledger
+
+
+def _resolve_rows(
+    df: pd.DataFrame, client: KeepaClient, use_network: bool
+) -> List[EvidenceRecord]:
+    """Resolve each row of df in place; returns the evidence ledger."""
     ledger: List[EvidenceRecord] = []
 
     for idx, row in df.iterrows():
@@ -336,7 +362,7 @@ def resolve_ids(
                 )
             )
 
-    return df, ledger
+    return ledger
 
 
 def write_ledger_jsonl(
@@ -349,16 +375,42 @@ def write_ledger_jsonl(
     if gzip_output and not str(out_path).endswith(".gz"):
         out_path = out_path.with_suffix(out_path.suffix + ".gz")
     opener = (
-        (lambda p: gzip.open(p, "wt", encoding="utf-8"))
-        if gzip_output
-        else (lambda p: open(p, "w", encoding="utf-8"))
+        (lambda p: gzip.open(p, "wb")) if gzip_output else (lambda p: open(p, "wb"))
     )
     with opener(out_path) as f:
         for rec in ledger:
-            f.write(json.dumps(asdict(rec), ensure_ascii=False) + "\n")
+            f.write(_ledger_line(asdict(rec)))
     return out_path
 
 
+def _ledger_line(payload: Dict[str, Any]) -> bytes:
+    """Serialize one ledger record to a UTF-8 JSONL line."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(payload, option=_ORJSON_OPTS)
+        except TypeError:
+            # orjson is stricter (e.g. arbitrary objects); fall back below
+            pass
+    # Match orjson's output: compact separators, NaN/inf as null, numpy as Python
+    line = json.dumps(_json_safe(payload), ensure_ascii=False, separators=(",", ":"))
+    return (line + "\n").encode("utf-8")
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert NaN/inf floats to None and numpy values to Python, recursively."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
 def enrich_keepa_stats(df_in, use_network: bool = True):
     """
     For rows with an ASIN (or at least a code), fetch Keepa stats and
@@ -384,6 +436,15 @@ def enrich_keepa_stats(df_in, use_network: bool = True):
         return df, []  # no-op
 
     client = KeepaClient()
+    try:
+        ledger = _enrich_rows(df, client)
+    finally:
+        client.close(wait=True)
+    return df, ledger
+
+
+def _enrich_rows(df: pd.DataFrame, client: KeepaClient) -> List[EvidenceRecord]:
+    """Fetch Keepa stats for each row of df in place; returns the ledger."""
     ledger = []
     for idx, row in df.iterrows():
         # Apply same precedence for stats: asin > upc > ean > canonical
@@ -516,4 +577,4 @@ def enrich_keepa_stats(df_in, use_network: bool = True):
                 timestamp=datetime.now(timezone.utc).isoformat(),
             )
         )
-    return df, ledger
+    return ledger
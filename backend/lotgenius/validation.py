@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, Union
 
 import pandas as pd
 
@@ -45,16 +47,54 @@ def _apply_mapping(df: pd.DataFrame, mapping: dict[str, str]) -> pd.DataFrame:
     return renamed
 
 
+# Canonical columns the content checks (run_ge_checks) look at
+CHECKED_COLS = {"quantity", "condition", "msrp"}
+
+
+ManifestSource = Union[str, os.PathLike, IO[str], IO[bytes]]
+
+
+def _read_manifest(
+    source: ManifestSource, fuzzy_threshold: int, encoding: str
+) -> tuple[list[str], dict[str, str], list[str], pd.DataFrame]:
+    # File-like sources are read twice (header, then body)
+    rewind = getattr(source, "seek", None)
+
+    # Header row only (pandas naming, incl. de-duplicated/unnamed columns)
+    if rewind:
+        rewind(0)
+    columns = list(pd.read_csv(source, encoding=encoding, nrows=0).columns)
+    mapping, unmapped = map_headers(columns, threshold=fuzzy_threshold)
+
+    # Only materialize the body columns the content checks need; keep one
+    # column regardless so the row count is still available
+    usecols = [i for i, c in enumerate(columns) if mapping.get(c) in CHECKED_COLS]
+    if rewind:
+        rewind(0)
+    df = pd.read_csv(source, encoding=encoding, usecols=usecols or [0])
+    return columns, mapping, unmapped, df
+
+
 def validate_manifest_csv(
-    csv_path: str | Path, fuzzy_threshold: int = 88
+    csv_path: ManifestSource, fuzzy_threshold: int = 88
 ) -> ValidationReport:
-    p = Path(csv_path)
-    df = pd.read_csv(p, encoding="utf-8-sig")
-
-    # Compute mapping and coverage
-    mapping, unmapped = map_headers(list(df.columns), threshold=fuzzy_threshold)
+    # Paths or open (seekable) file objects
+    if isinstance(csv_path, (str, os.PathLike)):
+        p = Path(csv_path)
+        report_path = str(p)
+    else:
+        p = csv_path
+        report_path = getattr(csv_path, "name", "<stream>")
+    # utf-8-sig drops a leading BOM during decoding, so headers arrive clean
+    try:
+        columns, mapping, unmapped, df = _read_manifest(p, fuzzy_threshold, "utf-8-sig")
+    except UnicodeDecodeError:
+        # Non-UTF-8 exports (e.g. Excel on Windows); latin-1 decodes any byte
+        columns, mapping, unmapped, df = _read_manifest(p, fuzzy_threshold, "latin-1")
+
+    # Compute coverage
     mapped_headers = len(mapping)
-    total_headers = len(df.columns)
+    total_headers = len(columns)
     header_coverage = mapped_headers / max(1, total_headers)
 
     mapped_df = _apply_mapping(df, mapping)
@@ -82,7 +122,7 @@ def validate_manifest_csv(
         notes.append(f"GE checks failed: {[r['expectation'] for r in bad]}")
 
     return ValidationReport(
-        path=str(p),
+        path=report_path,
         header_coverage=header_coverage,
         total_headers=total_headers,
         mapped_headers=mapped_headers,
@@ -7,3 +7,21 @@ import pytest
 def _clear_api_key_env():
     # Ensure tests don't inherit LOTGENIUS_API_KEY from CI/host
     os.environ.pop("LOTGENIUS_API_KEY", None)
+
+
+@pytest.fixture
+def patch_settings(monkeypatch):
+    """Return a setter that overrides attributes on the shared settings object."""
+    from lotgenius import config, gating, validation
+
+    # Tests that reload lotgenius.config leave modules holding older settings
+    # objects, so patch every distinct instance the gated code paths can see.
+    targets = {id(m.settings): m.settings for m in (config, gating, validation)}
+
+    def apply(**overrides):
+        for target in targets.values():
+            for name, value in overrides.items():
+                monkeypatch.setattr(target, name, value)
+        gating._get_gated_brands.cache_clear()
+
+    return apply
@@ -13,3 +13,12 @@ def test_utf8_bom_in_content(tmp_path: Path):
     assert (
         rep.header_coverage >= 2 / 3
     )  # SKU->sku_local, Item Name->title, Qty->quantity
+
+
+def test_non_utf8_manifest_falls_back_to_latin1(tmp_path: Path):
+    p = tmp_path / "latin1.csv"
+    # Windows-1252/latin-1 export: "é" is not valid UTF-8 on its own
+    p.write_bytes("SKU,Item Name,Qty\nA-1,Caf\xe9 Mug,1\n".encode("latin-1"))
+    rep = validate_manifest_csv(p, fuzzy_threshold=85)
+    assert rep.mapped_headers == 3
+    assert rep.passed, rep.notes
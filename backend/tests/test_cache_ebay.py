@@ -14,9 +14,12 @@ from lotgenius.cache_metrics import get_registry
 from lotgenius.datasources.base import SoldComp
 from lotgenius.datasources.ebay_scraper import (
     _cache_ebay_results,
+    _cache_scrape,
     _cleanup_expired_ebay_entries,
     _generate_query_fingerprint,
+    _generate_scrape_fingerprint,
     _get_cached_ebay_results,
+    _get_cached_scrape,
     fetch_sold_comps,
 )
 
@@ -366,6 +369,35 @@ class TestEBayFetchIntegration:
                 assert "misses" in comp.meta["cache_stats"]
 
 
+class TestEBayScrapeCache:
+    """Test the raw scrape cache keyed by targeted query."""
+
+    def test_scrape_fingerprint_ignores_title_inputs(self):
+        """Same targeted query and options share a fingerprint."""
+        fp1 = _generate_scrape_fingerprint('"012345678905" Apple', "New", 50, 180)
+        fp2 = _generate_scrape_fingerprint('"012345678905" Apple', " new ", 50, 180)
+        fp3 = _generate_scrape_fingerprint('"012345678905" Apple', "New", 50, 90)
+
+        assert fp1 == fp2
+        assert fp1 != fp3
+
+    def test_scrape_cache_round_trip(self, tmp_path, monkeypatch, sample_sold_comps):
+        """Stored raw comps are returned until the TTL expires."""
+        monkeypatch.setattr(
+            "lotgenius.datasources.ebay_scraper._EBAY_CACHE_PATH",
+            tmp_path / "ebay.sqlite",
+        )
+        fingerprint = _generate_scrape_fingerprint('"iPhone 14"', None, 50, 180)
+
+        assert _get_cached_scrape(fingerprint, 86400) is None
+        _cache_scrape(fingerprint, sample_sold_comps)
+
+        cached = _get_cached_scrape(fingerprint, 86400)
+        assert [c.title for c in cached] == [c.title for c in sample_sold_comps]
+        assert cached[0].sold_at == sample_sold_comps[0].sold_at
+        assert _get_cached_scrape(fingerprint, -1) is None
+
+
 class TestEBayCacheCleanup:
     """Test eBay cache cleanup functionality."""
 
@@ -385,6 +417,35 @@ class TestEBayCacheCleanup:
             assert mock_conn.commit.called
             assert mock_conn.close.called
 
+    def test_cleanup_removes_expired_scrape_rows(
+        self, tmp_path, monkeypatch, sample_sold_comps
+    ):
+        """Expired raw-scrape rows are pruned along with ebay_cache rows."""
+        import sqlite3
+
+        db_path = tmp_path / "ebay.sqlite"
+        monkeypatch.setattr(
+            "lotgenius.datasources.ebay_scraper._EBAY_CACHE_PATH", db_path
+        )
+        old_fp = _generate_scrape_fingerprint('"old query"', None, 50, 180)
+        new_fp = _generate_scrape_fingerprint('"new query"', None, 50, 180)
+        _cache_scrape(old_fp, sample_sold_comps)
+        _cache_scrape(new_fp, sample_sold_comps)
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE ebay_scrape_cache SET ts = ts - 1000 WHERE fingerprint = ?",
+            (old_fp,),
+        )
+        conn.commit()
+
+        _cleanup_expired_ebay_entries(300)
+
+        remaining = [
+            row[0] for row in conn.execute("SELECT fingerprint FROM ebay_scrape_cache")
+        ]
+        conn.close()
+        assert remaining == [new_fp]
+
     def test_cleanup_handles_errors_gracefully(self):
         """Test cleanup handles database errors gracefully."""
         with patch("sqlite3.connect") as mock_connect:
@@ -5,10 +5,13 @@ These tests are designed to run offline by monkeypatching cache methods.
 """
 
 import os
+import threading
 import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from lotgenius import keepa_client
 from lotgenius.cache_metrics import get_registry
 from lotgenius.keepa_client import KeepaClient, KeepaConfig, _cache_get, _cache_set
 
@@ -19,6 +22,14 @@ def reset_metrics():
     get_registry().reset_stats()
 
 
+@pytest.fixture(autouse=True)
+def fresh_connection():
+    """Give each test its own cache connection so sqlite3.connect patches apply."""
+    keepa_client._conns.close_all()
+    yield
+    keepa_client._conns.close_all()
+
+
 @pytest.fixture
 def mock_keepa_config():
     """Create a test Keepa configuration."""
@@ -62,8 +73,8 @@ class TestKeepaCache:
             "tokensLeft": 100,
         }
 
-        with patch("lotgenius.keepa_client._cache_get") as mock_get:
-            mock_get.return_value = cached_data
+        with patch("lotgenius.keepa_client._cache_get_entry") as mock_get:
+            mock_get.return_value = (cached_data, int(time.time()))
 
             client = KeepaClient(mock_keepa_config)
             result = client.lookup_by_code("123456789")
@@ -86,7 +97,7 @@ class TestKeepaCache:
         mock_response.status_code = 200
         mock_response.json.return_value = response_data
 
-        with patch("lotgenius.keepa_client._cache_get") as mock_get, patch(
+        with patch("lotgenius.keepa_client._cache_get_entry") as mock_get, patch(
             "lotgenius.keepa_client._cache_set"
         ) as mock_set, patch("requests.Session.get") as mock_request:
 
@@ -107,8 +118,8 @@ class TestKeepaCache:
         """Test TTL seconds override is respected."""
         cached_data = {"products": []}
 
-        with patch("lotgenius.keepa_client._cache_get") as mock_get:
-            mock_get.return_value = cached_data
+        with patch("lotgenius.keepa_client._cache_get_entry") as mock_get:
+            mock_get.return_value = (cached_data, int(time.time()))
 
             client = KeepaClient(mock_keepa_config_short_ttl)
             client.lookup_by_code("123456789")
@@ -119,10 +130,10 @@ class TestKeepaCache:
     def test_environment_ttl_override(self):
         """Test KEEPA_CACHE_TTL_SEC environment variable override."""
         with patch.dict(os.environ, {"KEEPA_CACHE_TTL_SEC": "10"}), patch(
-            "lotgenius.keepa_client._cache_get"
+            "lotgenius.keepa_client._cache_get_entry"
         ) as mock_get:
 
-            mock_get.return_value = {"products": []}
+            mock_get.return_value = ({"products": []}, int(time.time()))
 
             client = KeepaClient()
             client.lookup_by_code("123456789")
@@ -154,10 +165,10 @@ class TestKeepaCache:
     def test_cache_metrics_in_response(self, mock_keepa_config):
         """Test cache metrics are included in response when enabled."""
         with patch.dict(os.environ, {"CACHE_METRICS": "1"}), patch(
-            "lotgenius.keepa_client._cache_get"
+            "lotgenius.keepa_client._cache_get_entry"
         ) as mock_get:
 
-            mock_get.return_value = {"products": []}
+            mock_get.return_value = ({"products": []}, int(time.time()))
 
             client = KeepaClient(mock_keepa_config)
             result = client.lookup_by_code("123456789")
@@ -169,8 +180,8 @@ class TestKeepaCache:
 
     def test_different_cache_keys(self, mock_keepa_config):
         """Test different methods use different cache keys."""
-        with patch("lotgenius.keepa_client._cache_get") as mock_get:
-            mock_get.return_value = {"products": []}
+        with patch("lotgenius.keepa_client._cache_get_entry") as mock_get:
+            mock_get.return_value = ({"products": []}, int(time.time()))
 
             client = KeepaClient(mock_keepa_config)
 
@@ -207,10 +218,13 @@ class TestCacheFunctions:
             # Test cache set
             _cache_set(test_key, test_data)
 
-            # Verify database operations
+            # Verify database operations; the connection stays open for reuse
             assert mock_conn.execute.call_count >= 1
             assert mock_conn.commit.called
-            assert mock_conn.close.called
+            assert not mock_conn.close.called
+
+            _cache_set(test_key, test_data)
+            assert mock_connect.call_count == 1
 
     def test_cache_expiry(self):
         """Test cache expiry based on TTL."""
@@ -253,8 +267,8 @@ class TestCacheIntegration:
         """Test multiple client instances share the same cache."""
         cached_data = {"products": [{"asin": "B123"}]}
 
-        with patch("lotgenius.keepa_client._cache_get") as mock_get:
-            mock_get.return_value = cached_data
+        with patch("lotgenius.keepa_client._cache_get_entry") as mock_get:
+            mock_get.return_value = (cached_data, int(time.time()))
 
             client1 = KeepaClient(mock_keepa_config)
             client2 = KeepaClient(mock_keepa_config)
@@ -288,3 +302,25 @@ class TestCacheIntegration:
             # Verify cleanup was attempted
             assert mock_conn.execute.called
             assert mock_conn.commit.called
+
+
+def test_cache_recreated_after_db_file_removed(tmp_path, monkeypatch):
+    """A new connection recreates the schema if the cache file was deleted."""
+    db_path = tmp_path / "keepa_cache.sqlite"
+    monkeypatch.setattr(keepa_client, "_DB_PATH", db_path)
+    _cache_set("k1", {"a": 1})
+
+    # Simulate someone clearing the cache while this process keeps running
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    worker_result = {}
+
+    def worker():
+        _cache_set("k2", {"b": 2})
+        worker_result["value"] = _cache_get("k2", 60)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert worker_result["value"] == {"b": 2}
@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 
+import pytest
+
+from backend.lotgenius.datasources import ebay_scraper
 from backend.lotgenius.datasources.base import SoldComp
 from backend.lotgenius.datasources.ebay_scraper import (
     _build_targeted_query,
     _filter_results,
+    _parse_sold_date,
+    _parse_sold_items,
+    _title_similarities,
     _title_similarity,
     fetch_sold_comps,
 )
@@ -102,6 +108,15 @@ class TestTitleSimilarity:
         similarity = _title_similarity("iPhone 13 Pro", "Samsung Galaxy S22")
         assert similarity <= 0.3
 
+    def test_batch_similarity_matches_pairwise(self):
+        """Batched scores should equal the pairwise similarity per title."""
+        titles = ["iPhone 13 Pro Max", "Max Pro iPhone 13", "Samsung Galaxy S22"]
+        scores = _title_similarities(titles, "iPhone 13 Pro")
+        assert len(scores) == len(titles)
+        for title, score in zip(titles, scores):
+            assert score == _title_similarity(title, "iPhone 13 Pro")
+        assert len(_title_similarities([], "iPhone 13 Pro")) == 0
+
 
 class TestResultFiltering:
     """Test the result filtering functionality."""
@@ -255,6 +270,68 @@ class TestResultFiltering:
         assert recent_comp.match_score == recent_comp.meta["quality_score"]
 
 
+SOLD_PAGE_HTML = """
+<ul>
+    <li class="s-item">
+        <div class="s-item__title"><span>New Listing</span> iPhone 13 Pro 128GB</div>
+        <div class="s-item__price">$699.99</div>
+        <a class="s-item__link" href="https://example.com/item1?a=1&amp;b=2">Link</a>
+        <div class="s-item__ended-date">Sold  {recent}</div>
+    </li>
+    <li class="s-item">
+        <div class="s-item__title">iPhone 13 Pro No Price</div>
+    </li>
+    <li class="s-item">
+        <div class="s-item__title">iPhone 13 Pro Old</div>
+        <div class="s-item__price">$500.00</div>
+        <div class="s-item__ended-date">Jan 02, 2001</div>
+    </li>
+</ul>
+"""
+
+
+class TestParsing:
+    """Test HTML parsing of sold listing pages."""
+
+    @pytest.mark.parametrize("use_selectolax", [False, True])
+    def test_parse_sold_items(self, monkeypatch, use_selectolax):
+        """Both parser backends extract the same listing fields."""
+        if use_selectolax and not ebay_scraper.HAS_SELECTOLAX:
+            pytest.skip("selectolax not installed")
+        monkeypatch.setattr(ebay_scraper, "HAS_SELECTOLAX", use_selectolax)
+
+        recent = (datetime.now(timezone.utc) - timedelta(days=3)).strftime("%b %d, %Y")
+        comps = _parse_sold_items(
+            SOLD_PAGE_HTML.format(recent=recent), '"iphone 13"', "Used", 50, 180
+        )
+
+        assert len(comps) == 1
+        comp = comps[0]
+        assert comp.title == "New ListingiPhone 13 Pro 128GB"
+        assert comp.price == 699.99
+        assert comp.url == "https://example.com/item1?a=1&b=2"
+        assert comp.sold_at.strftime("%b %d, %Y") == recent
+        assert comp.condition == "Used"
+        assert comp.meta["query"] == '"iphone 13"'
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("Sold  Jan 15, 2024", datetime(2024, 1, 15, tzinfo=timezone.utc)),
+            ("Mar 3, 2024", datetime(2024, 3, 3, tzinfo=timezone.utc)),
+            ("Dec 05 2023", datetime(2023, 12, 5, tzinfo=timezone.utc)),
+            ("Sold  Mar 5, 2024", datetime(2024, 3, 5, tzinfo=timezone.utc)),
+            ("Sold Mar 5 2024", datetime(2024, 3, 5, tzinfo=timezone.utc)),
+            ("Sold Mar 15 2024 ", datetime(2024, 3, 15, tzinfo=timezone.utc)),
+            ("Feb 30, 2024", None),
+            ("n/a", None),
+        ],
+    )
+    def test_parse_sold_date(self, text, expected):
+        """Sold dates parse with one- or two-digit days, with or without comma."""
+        assert _parse_sold_date(text) == expected
+
+
 class TestIntegration:
     """Test integration with the main fetch_sold_comps function."""
 
@@ -1,7 +1,7 @@
 """Test _count_external_comps function alignment with writer format."""
 
 
-from lotgenius.evidence import _count_external_comps
+from lotgenius.evidence import EvidenceLedger, _count_external_comps
 
 
 def test_count_external_comps_num_comps_present():
@@ -162,3 +162,25 @@ def test_count_external_comps_preference_order():
 
     count = _count_external_comps(item, evidence_ledger, 180)
     assert count == 10, f"Expected count 10 from num_comps preference, got {count}"
+
+
+def test_evidence_ledger_by_source_index():
+    """Test that the ledger's source index stays in step with the record list."""
+    ledger = EvidenceLedger()
+    ledger.append({"source": "external_comps_summary", "meta": {"num_comps": 1}})
+    ledger.append({"source": "keepa", "meta": {}})
+    ledger.append({"source": "external_comps_summary", "meta": {"num_comps": 2}})
+
+    assert len(ledger) == 3
+    assert [e["source"] for e in ledger] == [
+        "external_comps_summary",
+        "keepa",
+        "external_comps_summary",
+    ]
+    summaries = ledger.by_source("external_comps_summary")
+    assert [e["meta"]["num_comps"] for e in summaries] == [1, 2]
+    assert ledger.by_source("missing") == []
+
+    ledger.clear()
+    assert len(ledger) == 0
+    assert ledger.by_source("external_comps_summary") == []
@@ -3,12 +3,15 @@
 import time
 from unittest.mock import patch
 
+import pytest
+
 from backend.lotgenius.datasources import ebay_scraper
 from backend.lotgenius.datasources.external_comps_cache import (
     _normalize_query_signature,
     clear_expired_cache,
     get_cached_comps,
     set_cached_comps,
+    set_cached_comps_many,
 )
 
 
@@ -116,8 +119,11 @@ def test_cache_ttl_expiration(tmp_path, monkeypatch):
     cached = get_cached_comps(source="ebay", title="Test")
     assert cached is not None
 
-    # Wait for expiration
-    time.sleep(2)
+    # Advance the cache clock past expiration
+    start = time.time()
+    monkeypatch.setattr(
+        "backend.lotgenius.datasources.external_comps_cache._now", lambda: start + 2
+    )
 
     # Should not get expired cache
     cached = get_cached_comps(source="ebay", title="Test")
@@ -279,16 +285,21 @@ def test_clear_expired_cache(tmp_path, monkeypatch):
         "backend.lotgenius.config.settings.EXTERNAL_COMPS_CACHE_TTL_DAYS", 1 / 86400
     )
 
-    # Add multiple cache entries
-    for i in range(3):
-        set_cached_comps(
-            source="ebay",
-            comps_data=[{"title": f"Item {i}", "price": i * 10}],
-            title=f"Query {i}",
-        )
+    # Add multiple cache entries in one batch
+    set_cached_comps_many(
+        {
+            "source": "ebay",
+            "comps_data": [{"title": f"Item {i}", "price": i * 10}],
+            "title": f"Query {i}",
+        }
+        for i in range(3)
+    )
 
-    # Wait for expiration
-    time.sleep(2)
+    # Advance the cache clock past expiration
+    start = time.time()
+    monkeypatch.setattr(
+        "backend.lotgenius.datasources.external_comps_cache._now", lambda: start + 2
+    )
 
     # Add a fresh entry
     set_cached_comps(
@@ -305,3 +316,115 @@ def test_clear_expired_cache(tmp_path, monkeypatch):
     cached = get_cached_comps(source="ebay", title="Fresh Query")
     assert cached is not None
     assert cached[0]["title"] == "Fresh Item"
+
+
+def test_expiry_delete_uses_timestamp_index(tmp_path, monkeypatch):
+    """Test that expired-entry cleanup is served by the timestamp index."""
+    import sqlite3
+
+    test_db = tmp_path / "test_cache.sqlite"
+    monkeypatch.setattr(
+        "backend.lotgenius.datasources.external_comps_cache._DB_PATH", test_db
+    )
+
+    set_cached_comps(source="ebay", comps_data=[], title="Indexed Query")
+
+    conn = sqlite3.connect(test_db)
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM comps_cache WHERE timestamp < ?", (0,)
+    ).fetchall()
+    conn.close()
+
+    assert any("idx_comps_cache_timestamp" in row[-1] for row in plan)
+
+
+def test_cache_memory_hits_return_fresh_objects(tmp_path, monkeypatch):
+    """Test that in-process cache hits cannot be mutated by callers."""
+    test_db = tmp_path / "test_cache.sqlite"
+    monkeypatch.setattr(
+        "backend.lotgenius.datasources.external_comps_cache._DB_PATH", test_db
+    )
+
+    set_cached_comps(
+        source="ebay", comps_data=[{"title": "Item", "price": 5.0}], title="Memo"
+    )
+
+    first = get_cached_comps(source="ebay", title="Memo")
+    first[0]["price"] = 999.0
+
+    second = get_cached_comps(source="ebay", title="Memo")
+    assert second[0]["price"] == 5.0
+
+
+def test_cache_reads_legacy_json_rows(tmp_path, monkeypatch):
+    """Test that rows stored as JSON text still decode alongside msgpack rows."""
+    pytest.importorskip("msgpack")
+    from backend.lotgenius.datasources import external_comps_cache
+
+    test_db = tmp_path / "test_cache.sqlite"
+    monkeypatch.setattr(external_comps_cache, "_DB_PATH", test_db)
+
+    comps = [{"title": "Legacy Item", "price": 12.5, "meta": {"similarity": 0.9}}]
+    monkeypatch.setattr(external_comps_cache, "HAS_MSGPACK", False)
+    set_cached_comps(source="ebay", comps_data=comps, title="Legacy")
+    monkeypatch.setattr(external_comps_cache, "HAS_MSGPACK", True)
+    set_cached_comps(source="google_search", comps_data=comps, title="Legacy")
+
+    # Force reads to go through SQLite rather than the in-process front
+    external_comps_cache._mem.clear()
+
+    assert get_cached_comps(source="ebay", title="Legacy") == comps
+    assert get_cached_comps(source="google_search", title="Legacy") == comps
+
+
+def test_in_memory_cache_persists_to_disk(tmp_path, monkeypatch):
+    """Test that the in-memory cache mode saves its contents to _DB_PATH."""
+    from backend.lotgenius.datasources import external_comps_cache
+
+    test_db = tmp_path / "test_cache.sqlite"
+    monkeypatch.setattr(external_comps_cache, "_DB_PATH", test_db)
+    monkeypatch.setattr(
+        "backend.lotgenius.config.settings.EXTERNAL_COMPS_CACHE_IN_MEMORY", True
+    )
+
+    comps = [{"title": "Memory Item", "price": 7.5}]
+    set_cached_comps(source="ebay", comps_data=comps, title="In Memory")
+    assert not test_db.exists()
+
+    external_comps_cache._persist_memory_db()
+    assert test_db.exists()
+
+    # Read back through a regular on-disk connection
+    monkeypatch.setattr(
+        "backend.lotgenius.config.settings.EXTERNAL_COMPS_CACHE_IN_MEMORY", False
+    )
+    external_comps_cache._mem.clear()
+    assert get_cached_comps(source="ebay", title="In Memory") == comps
+
+
+def test_cache_recovers_after_db_file_removed(tmp_path, monkeypatch):
+    """A new connection recreates the schema if the cache file was deleted."""
+    import threading
+    from pathlib import Path
+
+    test_db = tmp_path / "test_cache.sqlite"
+    monkeypatch.setattr(
+        "backend.lotgenius.datasources.external_comps_cache._DB_PATH", test_db
+    )
+    comps = [{"source": "ebay", "title": "Widget", "price": 10.0}]
+    set_cached_comps(source="ebay", comps_data=comps, title="Widget A")
+
+    # Simulate someone clearing the cache while this process keeps running
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{test_db}{suffix}").unlink(missing_ok=True)
+
+    result = {}
+
+    def worker():
+        set_cached_comps(source="ebay", comps_data=comps, title="Widget B")
+        result["comps"] = get_cached_comps(source="ebay", title="Widget B")
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert result["comps"] == comps
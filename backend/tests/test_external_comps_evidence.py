@@ -1,27 +1,23 @@
 """Test external comps evidence ledger consolidation."""
 
-from importlib import reload
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
-from backend.lotgenius.datasources import ebay_scraper
+from backend.lotgenius.config import settings
 from backend.lotgenius.datasources.base import SoldComp
 from backend.lotgenius.evidence import _global_evidence_ledger
-from backend.lotgenius.pricing.external_comps import gather_external_sold_comps
+from backend.lotgenius.pricing_modules.external_comps import (
+    _SCRAPERS,
+    gather_external_sold_comps,
+)
 
 
 def test_single_evidence_record_per_item(monkeypatch):
     """Test that exactly one external_comps_summary evidence record is written per item."""
-    # Enable scrapers
-    monkeypatch.setenv("ENABLE_EBAY_SCRAPER", "true")
-    monkeypatch.setenv("SCRAPER_TOS_ACK", "true")
-    monkeypatch.setenv("ENABLE_GOOGLE_SEARCH_ENRICHMENT", "false")
-
-    from backend.lotgenius import config as cfg
-
-    reload(cfg)
-
-    monkeypatch.setattr(cfg.settings, "ENABLE_EBAY_SCRAPER", True)
-    monkeypatch.setattr(cfg.settings, "SCRAPER_TOS_ACK", True)
+    # Toggle scrapers directly on the shared settings object
+    monkeypatch.setattr(settings, "ENABLE_EBAY_SCRAPER", True)
+    monkeypatch.setattr(settings, "SCRAPER_TOS_ACK", True)
+    monkeypatch.setattr(settings, "ENABLE_FB_SCRAPER", False)
+    monkeypatch.setattr(settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", False)
 
     # Mock eBay scraper to return test data
     test_comps = [
@@ -49,46 +45,36 @@ def test_single_evidence_record_per_item(monkeypatch):
         ),
     ]
 
-    with patch.object(ebay_scraper, "fetch_sold_comps", return_value=test_comps):
-        # Clear evidence ledger
-        _global_evidence_ledger.clear()
+    monkeypatch.setitem(_SCRAPERS, "ebay", MagicMock(return_value=test_comps))
 
-        item = {"title": "Test Product", "brand": "TestBrand", "sku_local": "TEST-001"}
+    # Clear evidence ledger
+    _global_evidence_ledger.clear()
 
-        # Gather external comps
-        comps = gather_external_sold_comps(item)
+    item = {"title": "Test Product", "brand": "TestBrand", "sku_local": "TEST-001"}
 
-        # Check evidence ledger
-        evidence_records = [
-            e
-            for e in _global_evidence_ledger
-            if e.get("source") == "external_comps_summary"
-        ]
+    # Gather external comps
+    comps = gather_external_sold_comps(item)
 
-        # Should have exactly one external_comps_summary record
-        assert len(evidence_records) == 1
+    # Check evidence ledger
+    evidence_records = _global_evidence_ledger.by_source("external_comps_summary")
 
-        record = evidence_records[0]
-        assert record["meta"]["num_comps"] == 2
-        assert record["meta"]["by_source"]["ebay"] == 2
-        assert record["meta"]["by_source"]["google_search"] == 0
-        assert len(record["meta"]["sample"]) == 2
+    # Should have exactly one external_comps_summary record
+    assert len(evidence_records) == 1
+
+    record = evidence_records[0]
+    assert record["meta"]["num_comps"] == 2
+    assert record["meta"]["by_source"]["ebay"] == 2
+    assert record["meta"]["by_source"]["google_search"] == 0
+    assert len(record["meta"]["sample"]) == 2
 
 
 def test_evidence_with_multiple_sources(monkeypatch):
     """Test evidence consolidation with multiple sources enabled."""
-    # Enable both eBay and Google
-    monkeypatch.setenv("ENABLE_EBAY_SCRAPER", "true")
-    monkeypatch.setenv("SCRAPER_TOS_ACK", "true")
-    monkeypatch.setenv("ENABLE_GOOGLE_SEARCH_ENRICHMENT", "true")
-
-    from backend.lotgenius import config as cfg
-
-    reload(cfg)
-
-    monkeypatch.setattr(cfg.settings, "ENABLE_EBAY_SCRAPER", True)
-    monkeypatch.setattr(cfg.settings, "SCRAPER_TOS_ACK", True)
-    monkeypatch.setattr(cfg.settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", True)
+    # Toggle scrapers directly on the shared settings object
+    monkeypatch.setattr(settings, "ENABLE_EBAY_SCRAPER", True)
+    monkeypatch.setattr(settings, "SCRAPER_TOS_ACK", True)
+    monkeypatch.setattr(settings, "ENABLE_FB_SCRAPER", False)
+    monkeypatch.setattr(settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", True)
 
     # Mock scrapers
     ebay_comps = [
@@ -119,127 +105,101 @@ def test_evidence_with_multiple_sources(monkeypatch):
         )
     ]
 
-    with patch.object(ebay_scraper, "fetch_sold_comps", return_value=ebay_comps):
-        # Mock google_search module
-        mock_gs = MagicMock()
-        mock_gs.fetch_sold_comps_from_google = MagicMock(return_value=google_comps)
+    monkeypatch.setitem(_SCRAPERS, "ebay", MagicMock(return_value=ebay_comps))
+    monkeypatch.setitem(
+        _SCRAPERS, "google_search", MagicMock(return_value=google_comps)
+    )
 
-        with patch.dict(
-            "sys.modules", {"backend.lotgenius.datasources.google_search": mock_gs}
-        ):
-            # Clear evidence ledger
-            _global_evidence_ledger.clear()
+    # Clear evidence ledger
+    _global_evidence_ledger.clear()
 
-            item = {
-                "title": "Multi-source Product",
-                "brand": "TestBrand",
-                "sku_local": "TEST-002",
-            }
+    item = {
+        "title": "Multi-source Product",
+        "brand": "TestBrand",
+        "sku_local": "TEST-002",
+    }
 
-            # Gather external comps
-            comps = gather_external_sold_comps(item)
+    # Gather external comps
+    comps = gather_external_sold_comps(item)
 
-            # Check evidence ledger
-            evidence_records = [
-                e
-                for e in _global_evidence_ledger
-                if e.get("source") == "external_comps_summary"
-            ]
+    # Check evidence ledger
+    evidence_records = _global_evidence_ledger.by_source("external_comps_summary")
 
-            # Should have exactly one consolidated record
-            assert len(evidence_records) == 1
+    # Should have exactly one consolidated record
+    assert len(evidence_records) == 1
 
-            record = evidence_records[0]
-            assert record["meta"]["num_comps"] == 2
-            assert record["meta"]["by_source"]["ebay"] == 1
-            assert record["meta"]["by_source"]["google_search"] == 1
-            assert len(record["meta"]["sample"]) == 2
+    record = evidence_records[0]
+    assert record["meta"]["num_comps"] == 2
+    assert record["meta"]["by_source"]["ebay"] == 1
+    assert record["meta"]["by_source"]["google_search"] == 1
+    assert len(record["meta"]["sample"]) == 2
 
 
 def test_evidence_with_errors(monkeypatch):
     """Test that errors are included in evidence but don't prevent summary."""
-    # Enable scrapers
-    monkeypatch.setenv("ENABLE_EBAY_SCRAPER", "true")
-    monkeypatch.setenv("SCRAPER_TOS_ACK", "true")
-    monkeypatch.setenv("ENABLE_GOOGLE_SEARCH_ENRICHMENT", "true")
+    # Toggle scrapers directly on the shared settings object
+    monkeypatch.setattr(settings, "ENABLE_EBAY_SCRAPER", True)
+    monkeypatch.setattr(settings, "SCRAPER_TOS_ACK", True)
+    monkeypatch.setattr(settings, "ENABLE_FB_SCRAPER", False)
+    monkeypatch.setattr(settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", True)
 
-    from backend.lotgenius import config as cfg
+    # Mock eBay to raise error
+    monkeypatch.setitem(
+        _SCRAPERS, "ebay", MagicMock(side_effect=Exception("Network error"))
+    )
 
-    reload(cfg)
+    # Mock google_search to return data
+    google_comps = [
+        SoldComp(
+            source="google_search",
+            title="Google Item",
+            price=30.0,
+            condition="New",
+            sold_at=None,
+            url=None,
+            id=None,
+            match_score=0.7,
+            meta={},
+        )
+    ]
 
-    monkeypatch.setattr(cfg.settings, "ENABLE_EBAY_SCRAPER", True)
-    monkeypatch.setattr(cfg.settings, "SCRAPER_TOS_ACK", True)
-    monkeypatch.setattr(cfg.settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", True)
+    monkeypatch.setitem(
+        _SCRAPERS, "google_search", MagicMock(return_value=google_comps)
+    )
 
-    # Mock eBay to raise error
-    with patch.object(
-        ebay_scraper, "fetch_sold_comps", side_effect=Exception("Network error")
-    ):
-        # Mock google_search to return data
-        google_comps = [
-            SoldComp(
-                source="google_search",
-                title="Google Item",
-                price=30.0,
-                condition="New",
-                sold_at=None,
-                url=None,
-                id=None,
-                match_score=0.7,
-                meta={},
-            )
-        ]
-
-        mock_gs = MagicMock()
-        mock_gs.fetch_sold_comps_from_google = MagicMock(return_value=google_comps)
-
-        with patch.dict(
-            "sys.modules", {"backend.lotgenius.datasources.google_search": mock_gs}
-        ):
-            # Clear evidence ledger
-            _global_evidence_ledger.clear()
-
-            item = {
-                "title": "Error Test Product",
-                "brand": "TestBrand",
-                "sku_local": "TEST-003",
-            }
-
-            # Gather external comps
-            comps = gather_external_sold_comps(item)
-
-            # Check evidence ledger
-            evidence_records = [
-                e
-                for e in _global_evidence_ledger
-                if e.get("source") == "external_comps_summary"
-            ]
-
-            # Should have exactly one record with errors noted
-            assert len(evidence_records) == 1
-
-            record = evidence_records[0]
-            assert record["meta"]["num_comps"] == 1  # Only Google succeeded
-            assert record["meta"]["by_source"]["ebay"] == 0
-            assert record["meta"]["by_source"]["google_search"] == 1
-            assert "errors" in record["meta"]
-            assert "ebay" in record["meta"]["errors"]
-            assert "Network error" in record["meta"]["errors"]["ebay"]
+    # Clear evidence ledger
+    _global_evidence_ledger.clear()
+
+    item = {
+        "title": "Error Test Product",
+        "brand": "TestBrand",
+        "sku_local": "TEST-003",
+    }
 
+    # Gather external comps
+    comps = gather_external_sold_comps(item)
 
-def test_no_evidence_when_scrapers_disabled(monkeypatch):
-    """Test that no external_comps_summary is written when scrapers are disabled."""
-    # Disable scrapers
-    monkeypatch.setenv("ENABLE_EBAY_SCRAPER", "false")
-    monkeypatch.setenv("SCRAPER_TOS_ACK", "false")
-    monkeypatch.setenv("ENABLE_GOOGLE_SEARCH_ENRICHMENT", "false")
+    # Check evidence ledger
+    evidence_records = _global_evidence_ledger.by_source("external_comps_summary")
 
-    from backend.lotgenius import config as cfg
+    # Should have exactly one record with errors noted
+    assert len(evidence_records) == 1
 
-    reload(cfg)
+    record = evidence_records[0]
+    assert record["meta"]["num_comps"] == 1  # Only Google succeeded
+    assert record["meta"]["by_source"]["ebay"] == 0
+    assert record["meta"]["by_source"]["google_search"] == 1
+    assert "errors" in record["meta"]
+    assert "ebay" in record["meta"]["errors"]
+    assert "Network error" in record["meta"]["errors"]["ebay"]
 
-    monkeypatch.setattr(cfg.settings, "ENABLE_EBAY_SCRAPER", False)
-    monkeypatch.setattr(cfg.settings, "SCRAPER_TOS_ACK", False)
+
+def test_no_evidence_when_scrapers_disabled(monkeypatch):
+    """Test that no external_comps_summary is written when scrapers are disabled."""
+    # Toggle scrapers directly on the shared settings object
+    monkeypatch.setattr(settings, "ENABLE_EBAY_SCRAPER", False)
+    monkeypatch.setattr(settings, "SCRAPER_TOS_ACK", False)
+    monkeypatch.setattr(settings, "ENABLE_GOOGLE_SEARCH_ENRICHMENT", False)
 
     # Clear evidence ledger
     _global_evidence_ledger.clear()
@@ -254,11 +214,7 @@ def test_no_evidence_when_scrapers_disabled(monkeypatch):
     comps = gather_external_sold_comps(item)
 
     # Check evidence ledger
-    evidence_records = [
-        e
-        for e in _global_evidence_ledger
-        if e.get("source") == "external_comps_summary"
-    ]
+    evidence_records = _global_evidence_ledger.by_source("external_comps_summary")
 
     # Should still write summary even with no comps (showing 0 results)
     assert len(evidence_records) == 1
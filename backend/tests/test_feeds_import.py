@@ -1,13 +1,14 @@
 """Unit tests for feed/watchlist CSV import functionality."""
 
-import tempfile
 from pathlib import Path
 
 import pytest
 from lotgenius.feeds import (
     FeedValidationError,
     feed_to_pipeline_items,
+    iter_pipeline_items,
     load_feed_csv,
+    load_feed_csv_iter,
     normalize_brand,
     normalize_condition,
     normalize_record,
@@ -15,40 +16,55 @@ from lotgenius.feeds import (
 )
 
 
+def _write_csv(tmp_path: Path, content: str, encoding: str = "utf-8") -> Path:
+    """Write CSV content to a scratch file under tmp_path."""
+    path = tmp_path / "feed.csv"
+    path.write_text(content, encoding=encoding)
+    return path
+
+
 class TestNormalizationFunctions:
     """Test individual normalization functions."""
 
-    def test_normalize_condition_standard_cases(self):
+    @pytest.mark.parametrize(
+        "raw,expected",
+        [
+            ("New", "New"),
+            ("new", "New"),
+            ("BRAND NEW", "New"),
+            ("factory sealed", "New"),
+            ("Like New", "Like New"),
+            ("like new", "Like New"),
+            ("Open Box", "Like New"),
+            ("excellent", "Like New"),
+            ("Good", "Used - Good"),
+            ("Used - Good", "Used - Good"),
+            ("very good", "Used - Good"),
+            ("Fair", "Used - Fair"),
+            ("used - fair", "Used - Fair"),
+            ("acceptable", "Used - Fair"),
+            ("Poor", "For Parts"),
+            ("damaged", "For Parts"),
+            ("for parts", "For Parts"),
+        ],
+    )
+    def test_normalize_condition_standard_cases(self, raw, expected):
         """Test condition normalization for standard cases."""
-        assert normalize_condition("New") == "New"
-        assert normalize_condition("new") == "New"
-        assert normalize_condition("BRAND NEW") == "New"
-        assert normalize_condition("factory sealed") == "New"
-
-        assert normalize_condition("Like New") == "Like New"
-        assert normalize_condition("like new") == "Like New"
-        assert normalize_condition("Open Box") == "Like New"
-        assert normalize_condition("excellent") == "Like New"
-
-        assert normalize_condition("Good") == "Used - Good"
-        assert normalize_condition("Used - Good") == "Used - Good"
-        assert normalize_condition("very good") == "Used - Good"
-
-        assert normalize_condition("Fair") == "Used - Fair"
-        assert normalize_condition("used - fair") == "Used - Fair"
-        assert normalize_condition("acceptable") == "Used - Fair"
-
-        assert normalize_condition("Poor") == "For Parts"
-        assert normalize_condition("damaged") == "For Parts"
-        assert normalize_condition("for parts") == "For Parts"
-
-    def test_normalize_condition_edge_cases(self):
+        assert normalize_condition(raw) == expected
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            "",  # Empty string
+            "  ",  # Whitespace only
+            "Unknown Status",  # Unrecognized
+            None,  # None input
+            123,  # Non-string input
+        ],
+    )
+    def test_normalize_condition_edge_cases(self, raw):
         """Test condition normalization edge cases."""
-        assert normalize_condition("") == "Used"  # Empty string
-        assert normalize_condition("  ") == "Used"  # Whitespace only
-        assert normalize_condition("Unknown Status") == "Used"  # Unrecognized
-        assert normalize_condition(None) == "Used"  # None input
-        assert normalize_condition(123) == "Used"  # Non-string input
+        assert normalize_condition(raw) == "Used"
 
     def test_normalize_brand(self):
         """Test brand normalization."""
@@ -171,158 +187,154 @@ class TestRecordNormalization:
         assert normalized["est_cost_per_unit"] is None  # Invalid converts to None
         assert normalized["msrp"] is None
 
+    def test_normalize_record_numeric_missing_markers(self):
+        """Blank and pandas NA numeric values normalize without raising."""
+        import pandas as pd
+
+        normalized = normalize_record(
+            {"title": "Test", "quantity": "  ", "est_cost_per_unit": pd.NA}
+        )
+
+        assert normalized["quantity"] == 1.0
+        assert normalized["est_cost_per_unit"] is None
+
 
 class TestCsvLoading:
     """Test CSV loading functionality."""
 
-    def create_temp_csv(self, content: str, encoding: str = "utf-8") -> Path:
-        """Helper to create temporary CSV file."""
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", encoding=encoding, delete=False
-        )
-        temp_file.write(content)
-        temp_file.close()
-        return Path(temp_file.name)
-
-    def test_load_valid_csv(self):
+    def test_load_valid_csv(self, tmp_path):
         """Test loading valid CSV with all expected data."""
         csv_content = """title,brand,condition,upc,quantity
 iPhone 14,Apple,New,194253413141,1
 Galaxy S23,Samsung,Used - Good,887276632166,2
 AirPods Pro,Apple,Like New,194252831403,1"""
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            records = load_feed_csv(str(temp_path))
-
-            assert len(records) == 3
+        path = _write_csv(tmp_path, csv_content)
+        records = load_feed_csv(str(path))
 
-            # Check first record
-            assert records[0]["title"] == "iPhone 14"
-            assert records[0]["brand"] == "apple"
-            assert records[0]["condition"] == "New"
-            assert records[0]["upc"] == "194253413141"
-            assert records[0]["quantity"] == 1.0
+        assert len(records) == 3
 
-        finally:
-            temp_path.unlink()
+        # Check first record
+        assert records[0]["title"] == "iPhone 14"
+        assert records[0]["brand"] == "apple"
+        assert records[0]["condition"] == "New"
+        assert records[0]["upc"] == "194253413141"
+        assert records[0]["quantity"] == 1.0
 
-    def test_load_csv_windows_crlf(self):
+    def test_load_csv_windows_crlf(self, tmp_path):
         """Test CSV with Windows CRLF line endings."""
         csv_content = 'title,brand,condition\r\n"Test Product","Test Brand","New"\r\n'
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            records = load_feed_csv(str(temp_path))
-
-            assert len(records) == 1
-            assert records[0]["title"] == "Test Product"
-            assert records[0]["brand"] == "test brand"
+        path = _write_csv(tmp_path, csv_content)
+        records = load_feed_csv(str(path))
 
-        finally:
-            temp_path.unlink()
+        assert len(records) == 1
+        assert records[0]["title"] == "Test Product"
+        assert records[0]["brand"] == "test brand"
 
-    def test_load_csv_quoted_fields(self):
+    def test_load_csv_quoted_fields(self, tmp_path):
         """Test CSV with quoted fields containing commas and quotes."""
         csv_content = '''title,brand,notes
 "iPhone 14, 128GB","Apple","Great phone, works well"
 "Samsung ""Galaxy"" S23","Samsung","Includes ""extras"""'''
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            records = load_feed_csv(str(temp_path))
+        path = _write_csv(tmp_path, csv_content)
+        records = load_feed_csv(str(path))
 
-            assert len(records) == 2
-            assert records[0]["title"] == "iPhone 14, 128GB"
-            assert records[0]["notes"] == "Great phone, works well"
-            assert records[1]["title"] == 'Samsung "Galaxy" S23'
-            assert records[1]["notes"] == 'Includes "extras"'
+        assert len(records) == 2
+        assert records[0]["title"] == "iPhone 14, 128GB"
+        assert records[0]["notes"] == "Great phone, works well"
+        assert records[1]["title"] == 'Samsung "Galaxy" S23'
+        assert records[1]["notes"] == 'Includes "extras"'
 
-        finally:
-            temp_path.unlink()
-
-    def test_load_csv_utf8_bom(self):
+    def test_load_csv_utf8_bom(self, tmp_path):
         """Test CSV with UTF-8 BOM handling."""
         csv_content = "title,brand,condition\nTest Product,Test Brand,New"
 
         # Write with BOM using utf-8-sig encoding
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", encoding="utf-8-sig", delete=False
-        )
-        temp_file.write(csv_content)
-        temp_file.close()
-        temp_path = Path(temp_file.name)
+        path = _write_csv(tmp_path, csv_content, encoding="utf-8-sig")
+        records = load_feed_csv(str(path))
+
+        assert len(records) == 1
+        assert records[0]["title"] == "Test Product"
 
-        try:
-            records = load_feed_csv(str(temp_path))
+    def test_load_csv_interns_brands(self, tmp_path):
+        """Repeated brands share one normalized string object."""
+        csv_content = """title,brand
+iPhone 14,Apple
+iPad Air, APPLE
+Galaxy S23,Samsung"""
 
-            assert len(records) == 1
-            assert records[0]["title"] == "Test Product"
+        path = _write_csv(tmp_path, csv_content)
+        records = load_feed_csv(str(path))
 
-        finally:
-            temp_path.unlink()
+        assert records[0]["brand"] == "apple"
+        assert records[0]["brand"] is records[1]["brand"]
 
-    def test_load_csv_missing_required_columns(self):
+    def test_load_csv_missing_required_columns(self, tmp_path):
         """Test CSV missing required columns."""
         csv_content = """brand,condition
 Apple,New
 Samsung,Used"""
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            with pytest.raises(FeedValidationError) as exc_info:
-                load_feed_csv(str(temp_path))
-
-            assert "Missing required columns: title" in str(exc_info.value)
+        path = _write_csv(tmp_path, csv_content)
+        with pytest.raises(FeedValidationError) as exc_info:
+            load_feed_csv(str(path))
 
-        finally:
-            temp_path.unlink()
+        assert "Missing required columns: title" in str(exc_info.value)
 
-    def test_load_csv_missing_id_columns(self):
+    def test_load_csv_missing_id_columns(self, tmp_path):
         """Test CSV missing all ID columns."""
         csv_content = """title,condition,notes
 Test Product,New,Some notes"""
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            with pytest.raises(FeedValidationError) as exc_info:
-                load_feed_csv(str(temp_path))
-
-            assert "At least one ID column required" in str(exc_info.value)
+        path = _write_csv(tmp_path, csv_content)
+        with pytest.raises(FeedValidationError) as exc_info:
+            load_feed_csv(str(path))
 
-        finally:
-            temp_path.unlink()
+        assert "At least one ID column required" in str(exc_info.value)
 
-    def test_load_csv_empty_title_row(self):
+    def test_load_csv_empty_title_row(self, tmp_path):
         """Test CSV with row having empty title."""
         csv_content = """title,brand
 iPhone 14,Apple
 ,Samsung"""  # Empty title in second row
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            with pytest.raises(FeedValidationError) as exc_info:
-                load_feed_csv(str(temp_path))
-
-            assert "Title is required" in str(exc_info.value)
-            assert "row 3" in str(exc_info.value)  # Row 3 (1-based, including header)
+        path = _write_csv(tmp_path, csv_content)
+        with pytest.raises(FeedValidationError) as exc_info:
+            load_feed_csv(str(path))
 
-        finally:
-            temp_path.unlink()
+        assert "Title is required" in str(exc_info.value)
+        assert "row 3" in str(exc_info.value)  # Row 3 (1-based, including header)
 
-    def test_load_csv_no_data_rows(self):
+    def test_load_csv_no_data_rows(self, tmp_path):
         """Test CSV with headers but no data."""
         csv_content = """title,brand,condition"""
 
-        temp_path = self.create_temp_csv(csv_content)
-        try:
-            with pytest.raises(FeedValidationError) as exc_info:
-                load_feed_csv(str(temp_path))
+        path = _write_csv(tmp_path, csv_content)
+        with pytest.raises(FeedValidationError) as exc_info:
+            load_feed_csv(str(path))
+
+        assert "CSV file contains no data rows" in str(exc_info.value)
+
+    def test_load_csv_iter_chunks(self, tmp_path):
+        """Chunked loading yields bounded chunks matching load_feed_csv."""
+        rows = "\n".join(f"Item {i},194253413141" for i in range(5))
+        path = _write_csv(tmp_path, "title,upc\n" + rows)
 
-            assert "CSV file contains no data rows" in str(exc_info.value)
+        chunks = list(load_feed_csv_iter(str(path), chunksize=2))
 
-        finally:
-            temp_path.unlink()
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [r for chunk in chunks for r in chunk] == load_feed_csv(str(path))
+
+    def test_load_csv_iter_reports_global_row(self, tmp_path):
+        """Validation errors in later chunks keep file-level row numbers."""
+        path = _write_csv(tmp_path, "title,brand\nA,x\nB,x\nC,x\n,x")
+
+        with pytest.raises(FeedValidationError) as exc_info:
+            list(load_feed_csv_iter(str(path), chunksize=2))
+
+        assert "row 5" in str(exc_info.value)
 
     def test_load_nonexistent_file(self):
         """Test loading non-existent file."""
@@ -432,11 +444,40 @@ class TestFeedToPipeline:
         assert pipeline_items[1]["sku_local"] == "FEED_0002"
         assert pipeline_items[2]["sku_local"] == "FEED_0003"
 
+    def test_iter_pipeline_items_numbers_across_chunks(self):
+        """Streaming conversion keeps SKU numbering global across chunks."""
+        records = [{"title": f"Item {i}", "brand": "acme"} for i in range(5)]
+
+        streamed = list(iter_pipeline_items([records[:2], records[2:4], records[4:]]))
+
+        assert streamed == feed_to_pipeline_items(records)
+        assert streamed[-1]["sku_local"] == "FEED_0005"
+
+    def test_feed_to_pipeline_items_ids_match_extract_ids(self):
+        """Column-wise ID extraction agrees with extract_ids() per record."""
+        from lotgenius.ids import extract_ids
+
+        feed_records = [
+            {"title": "A", "upc_ean_asin": " b0bdj7tljx "},
+            {"title": "B", "upc_ean_asin": "194253413140", "upc": "194253413141"},
+            {"title": "C", "upc_ean_asin": "4006381333931"},
+            {"title": "D", "upc": "1942-5341-3141", "ean": "4006381333931"},
+            {"title": "E", "upc": "194253413140", "ean": "4006381333931"},
+            {"title": "F", "upc": 194253413141, "asin": "B0BDJ7TLJ"},
+            {"title": "G"},
+        ]
+
+        pipeline_items = feed_to_pipeline_items(feed_records)
+
+        for record, item in zip(feed_records, pipeline_items):
+            for key, value in extract_ids(record).items():
+                assert item[key] == value
+
 
 class TestIntegrationScenarios:
     """Integration test scenarios with realistic data."""
 
-    def create_sample_csv(self) -> Path:
+    def create_sample_csv(self, tmp_path: Path) -> Path:
         """Create a sample feed CSV for integration testing."""
         csv_content = '''title,brand,condition,upc,asin,quantity,notes,category
 "iPhone 14 Pro 128GB","Apple","New","194253413141","B0BDJ7TLJX","1","Unlocked","Electronics"
@@ -444,76 +485,58 @@ class TestIntegrationScenarios:
 "AirPods Pro 2nd Gen","Apple","Like New","","B0BDHB9Y8H","1","Open box","Audio"
 "Generic USB Cable","Generic","Used","","","5","Bulk lot","Accessories"'''
 
-        temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
-        temp_file.write(csv_content)
-        temp_file.close()
-        return Path(temp_file.name)
+        return _write_csv(tmp_path, csv_content)
 
-    def test_complete_workflow(self):
+    def test_complete_workflow(self, tmp_path):
         """Test complete workflow from CSV to pipeline items."""
-        temp_path = self.create_sample_csv()
-
-        try:
-            # Load and normalize
-            feed_records = load_feed_csv(str(temp_path))
-            assert len(feed_records) == 4
+        path = self.create_sample_csv(tmp_path)
 
-            # Convert to pipeline format
-            pipeline_items = feed_to_pipeline_items(feed_records)
-            assert len(pipeline_items) == 4
+        # Load and normalize
+        feed_records = load_feed_csv(str(path))
+        assert len(feed_records) == 4
 
-            # Verify specific transformations
-            iphone = pipeline_items[0]
-            assert iphone["title"] == "iPhone 14 Pro 128GB"
-            assert iphone["brand"] == "apple"
-            assert iphone["condition"] == "New"
-            assert iphone["upc"] == "194253413141"
-            assert iphone["asin"] == "B0BDJ7TLJX"
+        # Convert to pipeline format
+        pipeline_items = feed_to_pipeline_items(feed_records)
+        assert len(pipeline_items) == 4
 
-            galaxy = pipeline_items[1]
-            assert galaxy["condition"] == "Used - Good"
-            assert galaxy["quantity"] == 2.0
+        # Verify specific transformations
+        iphone = pipeline_items[0]
+        assert iphone["title"] == "iPhone 14 Pro 128GB"
+        assert iphone["brand"] == "apple"
+        assert iphone["condition"] == "New"
+        assert iphone["upc"] == "194253413141"
+        assert iphone["asin"] == "B0BDJ7TLJX"
 
-            airpods = pipeline_items[2]
-            assert airpods["condition"] == "Like New"
-            assert airpods["asin"] == "B0BDHB9Y8H"
+        galaxy = pipeline_items[1]
+        assert galaxy["condition"] == "Used - Good"
+        assert galaxy["quantity"] == 2.0
 
-            # Generic item with minimal data
-            generic = pipeline_items[3]
-            assert generic["title"] == "Generic USB Cable"
-            assert generic["brand"] == "generic"  # Has brand now
-            assert generic["condition"] == "Used"
-            assert generic["quantity"] == 5.0
+        airpods = pipeline_items[2]
+        assert airpods["condition"] == "Like New"
+        assert airpods["asin"] == "B0BDHB9Y8H"
 
-        finally:
-            temp_path.unlink()
+        # Generic item with minimal data
+        generic = pipeline_items[3]
+        assert generic["title"] == "Generic USB Cable"
+        assert generic["brand"] == "generic"  # Has brand now
+        assert generic["condition"] == "Used"
+        assert generic["quantity"] == 5.0
 
 
-def test_load_csv_unsupported_encoding():
+def test_load_csv_unsupported_encoding(tmp_path):
     """Test handling of files that can be decoded but have malformed CSV structure."""
-    import tempfile
-
-    from lotgenius.feeds import FeedValidationError, load_feed_csv
-
-    # Create a temporary file with data that can be decoded but makes no sense as CSV
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False, encoding="utf-8"
-    ) as f:
-        # Write binary-like content that's technically decodable but not valid CSV
-        f.write(
-            "".join(chr(i) for i in range(32, 127))
-            + "\n"
-            + "more garbage data\x00\x01\x02"
-        )
-        temp_path = Path(f.name)
-
-    try:
-        # This should fail with CSV validation error, not encoding error
-        # Since the modern encodings are quite permissive, we test CSV structure validation instead
-        with pytest.raises(
-            FeedValidationError,
-            match="Missing required columns: title|CSV file has no headers",
-        ):
-            load_feed_csv(str(temp_path))
-    finally:
-        temp_path.unlink()
+    # Write binary-like content that's technically decodable but not valid CSV
+    path = _write_csv(
+        tmp_path,
+        "".join(chr(i) for i in range(32, 127))
+        + "\n"
+        + "more garbage data\x00\x01\x02",
+    )
+
+    # This should fail with CSV validation error, not encoding error
+    # Since the modern encodings are quite permissive, we test CSV structure validation instead
+    with pytest.raises(
+        FeedValidationError,
+        match="Missing required columns: title|CSV file has no headers",
+    ):
+        load_feed_csv(str(path))
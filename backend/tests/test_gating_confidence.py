@@ -7,7 +7,15 @@ for ambiguous items while preserving existing behavior for high-trust IDs.
 
 from unittest.mock import patch
 
-from backend.lotgenius.gating import _ambiguity_flags, passes_evidence_gate
+import pandas as pd
+import pytest
+
+from backend.lotgenius.gating import (
+    _ambiguity_flags,
+    _confidence_gate,
+    passes_evidence_gate,
+    passes_evidence_gate_batch,
+)
 
 
 class TestAmbiguityFlags:
@@ -80,10 +88,34 @@ class TestAmbiguityFlags:
         assert "ambiguous:condition" in flags
         assert len(flags) == 3
 
+    def test_generic_terms_match_whole_words(self):
+        """Generic terms match as words, not inside unrelated words."""
+        base = {"brand": "Acme", "condition": "New"}
+        assert "generic:title" in _ambiguity_flags({**base, "title": "Pens (lot, 12)"})
+        assert "generic:title" in _ambiguity_flags(
+            {**base, "title": "Laptop - for parts"}
+        )
+        assert _ambiguity_flags({**base, "title": "Pilot G2 Showcase Pen"}) == []
+
 
 class TestConfidenceGating:
     """Test confidence-aware evidence gating functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_gate_cache(self):
+        _confidence_gate.cache_clear()
+        yield
+        _confidence_gate.cache_clear()
+
+    def test_repeated_items_reuse_cached_result(self):
+        """Identical items hit the cache and share immutable tag tuples."""
+        item = {"title": "iPhone 13 Pro Max", "brand": "Apple", "condition": "New"}
+        first = passes_evidence_gate(item, 3, True, False)
+        second = passes_evidence_gate(dict(item), 3, True, False)
+        assert _confidence_gate.cache_info().hits == 1
+        assert first == second
+        assert isinstance(first.tags, tuple)
+
     def test_non_ambiguous_passes_base_threshold(self):
         """Clean item should pass with base threshold (3 comps)."""
         item = {
@@ -204,6 +236,8 @@ class TestConfidenceGating:
         assert result.core_included
         assert "id:trusted" in result.tags
         assert result.reason == "High-trust ID present"
+        # The bypass returns before any ambiguity/threshold work
+        assert _confidence_gate.cache_info().currsize == 0
 
     def test_max_comps_cap_applied(self):
         """Required comps should be capped at EVIDENCE_MIN_COMPS_MAX."""
@@ -316,3 +350,46 @@ class TestConfidenceGating:
 
             assert result.passed
             assert "comps:>=5" in result.tags
+
+
+class TestBatchGate:
+    """Vectorized gate must agree with the per-item gate."""
+
+    @pytest.mark.parametrize("hazmat_policy", ["exclude", "review", "allow"])
+    def test_batch_matches_per_item(self, hazmat_policy):
+        # NaN counts as truthy in the per-item hazmat check, so fill the column
+        items = pd.DataFrame(
+            [
+                {"title": "Apple iPhone 13", "brand": "Apple", "condition": "New"},
+                {"title": "Lot of assorted cables", "brand": "Generic"},
+                {"title": "Sony headphones", "brand": None, "condition": "unknown"},
+                {"title": "Backpack", "brand": "nan"},
+                {"title": "Spare parts for parts", "brand": "Acme"},
+                {"title": "", "brand": "", "condition": " Unspecified "},
+                {"title": "Lots5 bundle", "brand": "Samsung"},
+            ]
+        ).assign(hazmat=[False, False, False, True, True, False, False])
+        comps = [3, 4, 4, 5, 2, 3, 6]
+        secondary = [True, True, True, False, True, True, True]
+        trusted = [False, False, False, False, True, False, False]
+
+        with patch("backend.lotgenius.gating.settings") as mock_settings:
+            mock_settings.GATED_BRANDS_CSV = "Samsung"
+            mock_settings.HAZMAT_POLICY = hazmat_policy
+            mock_settings.EVIDENCE_MIN_COMPS_BASE = 3
+            mock_settings.EVIDENCE_AMBIGUITY_BONUS_PER_FLAG = 1
+            mock_settings.EVIDENCE_MIN_COMPS_MAX = 5
+
+            expected = [
+                passes_evidence_gate(item, c, s, t).core_included
+                for item, c, s, t in zip(
+                    items.to_dict("records"), comps, secondary, trusted
+                )
+            ]
+            result = passes_evidence_gate_batch(items, comps, secondary, trusted)
+
+        assert result.tolist() == expected
+
+    def test_batch_empty_frame(self):
+        result = passes_evidence_gate_batch(pd.DataFrame(), [], [], [])
+        assert result.shape == (0,)
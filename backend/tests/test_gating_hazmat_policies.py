@@ -4,6 +4,12 @@ import pytest
 from lotgenius.gating import passes_evidence_gate
 
 
+@pytest.fixture(autouse=True)
+def _default_policies(patch_settings):
+    """Start every test with no gated brands and the review hazmat policy."""
+    patch_settings(GATED_BRANDS_CSV="", HAZMAT_POLICY="review")
+
+
 @pytest.fixture
 def sample_items():
     """Sample items with various brand and hazmat characteristics."""
@@ -41,19 +47,9 @@ def sample_items():
 class TestBrandGating:
     """Test brand gating functionality."""
 
-    def test_brand_gate_with_gated_brands(self, sample_items, monkeypatch):
+    def test_brand_gate_with_gated_brands(self, sample_items, patch_settings):
         """Test brand gating with brands in gated list."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "Apple,Samsung")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="Apple,Samsung")
 
         apple_item = sample_items[0]
         samsung_item = sample_items[1]
@@ -72,38 +68,18 @@ class TestBrandGating:
         generic_result = passes_evidence_gate(generic_item, 10, True, True)
         assert generic_result.core_included
 
-    def test_brand_gate_with_empty_gated_list(self, sample_items, monkeypatch):
+    def test_brand_gate_with_empty_gated_list(self, sample_items, patch_settings):
         """Test brand gating with empty gated brands list."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="")
 
         # All brands should pass when no brands are gated (with good evidence)
         for item in sample_items:
             result = passes_evidence_gate(item, 50, True, True)
             assert result.core_included
 
-    def test_brand_gate_case_insensitive(self, sample_items, monkeypatch):
+    def test_brand_gate_case_insensitive(self, sample_items, patch_settings):
         """Test brand gating is case insensitive."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "apple,SAMSUNG")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="apple,SAMSUNG")
 
         apple_item = sample_items[0]  # brand: "Apple"
         samsung_item = sample_items[1]  # brand: "Samsung"
@@ -115,19 +91,9 @@ class TestBrandGating:
         samsung_result = passes_evidence_gate(samsung_item, 30, True, True)
         assert not samsung_result.core_included
 
-    def test_brand_gate_with_missing_brand(self, sample_items, monkeypatch):
+    def test_brand_gate_with_missing_brand(self, sample_items, patch_settings):
         """Test brand gating with missing brand field."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "Apple")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="Apple")
 
         noname_item = sample_items[3]  # brand: ""
 
@@ -139,19 +105,9 @@ class TestBrandGating:
 class TestHazmatPolicies:
     """Test hazmat policy functionality."""
 
-    def test_hazmat_policy_exclude(self, sample_items, monkeypatch):
+    def test_hazmat_policy_exclude(self, sample_items, patch_settings):
         """Test hazmat policy exclude - hazmat items should fail."""
-        monkeypatch.setenv("HAZMAT_POLICY", "exclude")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(HAZMAT_POLICY="exclude")
 
         non_hazmat = sample_items[0]  # hazmat: False
         hazmat_item = sample_items[2]  # hazmat: True
@@ -165,38 +121,18 @@ class TestHazmatPolicies:
         assert not hazmat_result.core_included
         assert "Hazmat excluded" in hazmat_result.reason
 
-    def test_hazmat_policy_allow(self, sample_items, monkeypatch):
+    def test_hazmat_policy_allow(self, sample_items, patch_settings):
         """Test hazmat policy allow - all items should pass."""
-        monkeypatch.setenv("HAZMAT_POLICY", "allow")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(HAZMAT_POLICY="allow")
 
         # All items should pass regardless of hazmat status (with good evidence)
         for item in sample_items:
             result = passes_evidence_gate(item, 50, True, True)
             assert result.core_included
 
-    def test_hazmat_policy_review(self, sample_items, monkeypatch):
+    def test_hazmat_policy_review(self, sample_items, patch_settings):
         """Test hazmat policy review - hazmat items allowed but tagged."""
-        monkeypatch.setenv("HAZMAT_POLICY", "review")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(HAZMAT_POLICY="review")
 
         non_hazmat = sample_items[0]  # hazmat: False
         hazmat_item = sample_items[2]  # hazmat: True
@@ -210,19 +146,30 @@ class TestHazmatPolicies:
         assert hazmat_result.core_included
         assert "hazmat:review" in hazmat_result.tags
 
-    def test_hazmat_gate_missing_field(self, sample_items, monkeypatch):
+    @pytest.mark.parametrize(
+        "policy, expected_tag, included",
+        [
+            (" Exclude ", None, False),
+            ("REVIEW", "hazmat:review", True),
+            (None, "hazmat:review", True),
+            ("unknown", "hazmat:allow", True),
+        ],
+    )
+    def test_hazmat_policy_normalization(
+        self, sample_items, patch_settings, policy, expected_tag, included
+    ):
+        """Policy strings are case/space-insensitive; unknown values allow."""
+        patch_settings(HAZMAT_POLICY=policy)
+
+        result = passes_evidence_gate(sample_items[2], 10, True, True)
+        assert result.core_included is included
+        assert "hazmat" in result.tags
+        if expected_tag:
+            assert expected_tag in result.tags
+
+    def test_hazmat_gate_missing_field(self, sample_items, patch_settings):
         """Test hazmat gating with missing is_hazmat field."""
-        monkeypatch.setenv("HAZMAT_POLICY", "exclude")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(HAZMAT_POLICY="exclude")
 
         # Item without is_hazmat field
         item_no_hazmat = {"sku_local": "TEST_001", "brand": "Test"}
@@ -235,20 +182,9 @@ class TestHazmatPolicies:
 class TestCombinedGating:
     """Test combined brand and hazmat gating through evidence gate."""
 
-    def test_evidence_gate_combined_policies(self, sample_items, monkeypatch):
+    def test_evidence_gate_combined_policies(self, sample_items, patch_settings):
         """Test evidence gate with both brand and hazmat policies."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "Apple")
-        monkeypatch.setenv("HAZMAT_POLICY", "exclude")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="Apple", HAZMAT_POLICY="exclude")
 
         apple_item = sample_items[0]  # Apple, non-hazmat
         samsung_item = sample_items[1]  # Samsung, non-hazmat
@@ -281,20 +217,18 @@ class TestCombinedGating:
         )
         assert not gate_result.core_included
 
-    def test_evidence_gate_review_over_exclude(self, sample_items, monkeypatch):
-        """Test that review policy allows items through core but flags them."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "")
-        monkeypatch.setenv("HAZMAT_POLICY", "review")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
+    def test_brand_gate_short_circuits_hazmat(self, sample_items, patch_settings):
+        """A gated brand rejects first; hazmat policy is not evaluated."""
+        patch_settings(GATED_BRANDS_CSV="Generic", HAZMAT_POLICY="exclude")
 
-        lotgenius.config.settings = Settings()
-        import importlib
+        result = passes_evidence_gate(sample_items[2], 10, True, True)
+        assert not result.core_included
+        assert result.reason == "Brand gated: Generic"
+        assert result.tags == ("brand:gated",)
 
-        importlib.reload(lotgenius.gating)
+    def test_evidence_gate_review_over_exclude(self, sample_items, patch_settings):
+        """Test that review policy allows items through core but flags them."""
+        patch_settings(GATED_BRANDS_CSV="", HAZMAT_POLICY="review")
 
         battery_item = sample_items[2]  # Generic, hazmat
 
@@ -308,20 +242,9 @@ class TestCombinedGating:
         assert gate_result.core_included  # Should pass through
         assert "hazmat:review" in gate_result.tags  # But tagged for review
 
-    def test_evidence_gate_allow_policy(self, sample_items, monkeypatch):
+    def test_evidence_gate_allow_policy(self, sample_items, patch_settings):
         """Test that allow policy lets hazmat items through."""
-        monkeypatch.setenv("GATED_BRANDS_CSV", "")
-        monkeypatch.setenv("HAZMAT_POLICY", "allow")
-
-        # Force reload of settings
-        import lotgenius.config
-        import lotgenius.gating
-        from lotgenius.config import Settings
-
-        lotgenius.config.settings = Settings()
-        import importlib
-
-        importlib.reload(lotgenius.gating)
+        patch_settings(GATED_BRANDS_CSV="", HAZMAT_POLICY="allow")
 
         battery_item = sample_items[2]  # Generic, hazmat
 
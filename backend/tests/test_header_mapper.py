@@ -74,3 +74,16 @@ def test_find_conflicts_detects_duplicates():
     conflicts = find_conflicts(mapping)
     assert "title" in conflicts
     assert set(conflicts["title"]) == {"Title", "Item Name"}
+
+
+def test_repeated_headers_hit_match_cache(tmp_path, monkeypatch):
+    from lotgenius import headers as h
+
+    monkeypatch.setattr(h, "ALIAS_STORE", tmp_path / "aliases.json")
+    h._match_one.cache_clear()
+
+    first = map_headers(["SKU", "Weird Random Column"], threshold=80)
+    second = map_headers(["SKU", "Weird Random Column"], threshold=80)
+
+    assert first == second
+    assert h._match_one.cache_info().hits == 2
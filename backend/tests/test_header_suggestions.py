@@ -25,3 +25,15 @@ def test_suggest_candidates_different_top_k():
     assert len(out5) == 5
     # First item should be the same
     assert out1[0]["candidate"] == out5[0]["candidate"]
+
+
+def test_suggest_candidates_cached_results_are_independent():
+    from lotgenius import headers as h
+
+    h._suggest_cached.cache_clear()
+    first = suggest_candidates("Brand Name", top_k=3)
+    first[0]["score"] = -1
+    second = suggest_candidates("Brand Name", top_k=3)
+
+    assert h._suggest_cached.cache_info().hits == 1
+    assert second[0]["score"] != -1
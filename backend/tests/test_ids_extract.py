@@ -4,7 +4,9 @@ Test cases for ID extraction from lotgenius.ids module.
 Covers various input formats and edge cases for UPC/EAN/ASIN extraction.
 """
 
-from lotgenius.ids import extract_ids
+import pandas as pd
+import pytest
+from lotgenius.ids import _is_asin, _is_ean, _is_upc, extract_ids, extract_ids_frame
 
 
 class TestExtractIds:
@@ -199,3 +201,43 @@ class TestExtractIds:
         assert result["upc"] is None  # not 12 digits
         assert result["ean"] is None  # not 13 digits
         assert result["asin"] is None
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"upc_ean_asin": "012345678905"},
+        {"asin": "  b012345678  "},
+        {"upc": "012345678905", "ean": "4006381333931"},
+        {"ean": "4006381333931"},
+        {"upc_ean_asin": "0-12.345 678/905", "upc": "999888777666"},
+        {"upc_ean_asin": "invalid123"},
+        {"upc_ean_asin": "toolong12345"},
+        {"upc_ean_asin": "", "upc": None, "ean": "", "asin": None},
+        {"upc": 12345678905, "asin": float("nan")},
+        {"title": "Some product", "price": 29.99},
+    ],
+)
+def test_extract_ids_frame_matches_extract_ids(item):
+    """The vectorized frame path agrees with the per-item extract_ids."""
+    frame = extract_ids_frame(pd.DataFrame([item], index=[7]))
+
+    assert list(frame.index) == [7]
+    assert frame.iloc[0].to_dict() == extract_ids(item)
+
+
+@pytest.mark.parametrize(
+    "value, is_asin, is_upc, is_ean",
+    [
+        ("B08N5WRWNW", True, False, False),
+        ("0123456789", True, False, False),  # ISBN-10 style ASIN
+        ("012345678905", False, True, False),
+        ("012345678906", False, False, False),  # bad check digit
+        ("4006381333931", False, False, True),
+        ("12345", False, False, False),
+    ],
+)
+def test_id_shape_predicates(value, is_asin, is_upc, is_ean):
+    assert _is_asin(value) is is_asin
+    assert _is_upc(value) is is_upc
+    assert _is_ean(value) is is_ean
@@ -4,7 +4,11 @@ Test cases for UPC check digit validation in lotgenius.ids module.
 Covers UPC-A check digit validation and integration with ID extraction.
 """
 
-from lotgenius.ids import extract_ids, validate_upc_check_digit
+from lotgenius.ids import (
+    extract_ids,
+    validate_upc_check_digit,
+    validate_upc_check_digit_batch,
+)
 
 
 class TestUpcCheckDigitValidation:
@@ -106,3 +110,22 @@ class TestUpcCheckDigitValidation:
         assert result["upc_ean_asin"] == "012345678901"  # Canonical preserved
         assert result["ean"] is None
         assert result["asin"] is None
+
+    def test_validate_upc_check_digit_batch_matches_scalar(self):
+        """Batch validation agrees with the scalar check for every input."""
+        values = [
+            "012345678905",
+            "123456789012",
+            "036000291452",
+            "012345678901",
+            "",
+            "12345",
+            "1234567890123",
+            "12345678901a",
+            None,
+            123456789012,
+        ]
+        result = validate_upc_check_digit_batch(values)
+
+        assert result.tolist() == [validate_upc_check_digit(v) for v in values]
+        assert validate_upc_check_digit_batch([]).shape == (0,)
@@ -1,6 +1,8 @@
 import json
+import logging
 from pathlib import Path
 
+import pytest
 from lotgenius.keepa_client import KeepaClient, KeepaConfig, extract_primary_asin
 
 
@@ -23,6 +25,14 @@ def test_extract_primary_asin_fixture():
     assert extract_primary_asin(payload) == "B00TESTASIN"
 
 
+def test_extract_primary_asin_missing():
+    assert extract_primary_asin({}) is None
+    assert extract_primary_asin(None) is None
+    assert extract_primary_asin({"products": []}) is None
+    assert extract_primary_asin({"products": None}) is None
+    assert extract_primary_asin({"products": [{}]}) is None
+
+
 def test_lookup_by_code_caches(monkeypatch, tmp_path):
     # Use isolated cache path for test
     cache_path = tmp_path / "keepa_cache.sqlite"
@@ -61,3 +71,366 @@ def test_db_file_created_on_init(tmp_path, monkeypatch):
     # Instantiate client -> should create DB (via eager _db() in __init__)
     kc.KeepaClient(kc.KeepaConfig(api_key="FAKE"))  # pragma: allowlist secret
     assert tmp_db.exists(), "Keepa cache DB was not created on init"
+
+
+def test_lookup_by_code_memory_hit_skips_sqlite(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_days=1))
+    payload = {"products": [{"asin": "B00TESTASIN"}]}
+    monkeypatch.setattr(
+        client.session,
+        "get",
+        lambda url, params=None, timeout=None: DummyResp(200, payload),
+    )
+    sqlite_reads = {"n": 0}
+    real_cache_get = kc._cache_get_entry
+
+    def counting_cache_get(key, ttl_sec):
+        sqlite_reads["n"] += 1
+        return real_cache_get(key, ttl_sec)
+
+    monkeypatch.setattr(kc, "_cache_get_entry", counting_cache_get)
+
+    r1 = client.lookup_by_code("012345678905")
+    r2 = client.lookup_by_code("012345678905")
+
+    assert not r1["cached"] and r2["cached"]
+    assert r2["data"] == payload
+    assert sqlite_reads["n"] == 1
+
+    # A second client starts cold but is served from SQLite
+    r3 = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_days=1)).lookup_by_code(
+        "012345678905"
+    )
+    assert r3["cached"] and sqlite_reads["n"] == 2
+
+
+def test_memory_cache_expires_with_sqlite_row(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(
+        KeepaConfig(api_key="FAKE_KEY", ttl_sec=100, serve_stale=False)
+    )
+    fetched = {"n": 0}
+
+    def fake_get(url, params=None, timeout=None):
+        fetched["n"] += 1
+        return DummyResp(200, {"products": [{"asin": "B00FRESH001"}]})
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    now = {"t": 1_000_000.0}
+    monkeypatch.setattr(kc.time, "time", lambda: now["t"])
+
+    # Row stored 99s ago is still fresh and gets loaded into memory
+    now["t"] -= 99
+    kc._cache_set("product:1:012345678905", {"products": [{"asin": "B00OLDROW01"}]})
+    now["t"] += 99
+    assert client.lookup_by_code("012345678905")["cached"]
+
+    # 90s later the row is 189s old: memory must not outlive it
+    now["t"] += 90
+    result = client.lookup_by_code("012345678905")
+    assert not result["cached"]
+    assert extract_primary_asin(result["data"]) == "B00FRESH001"
+    assert fetched["n"] == 1
+
+
+def test_lookup_by_codes_batches_misses(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    cfg = KeepaConfig(api_key="FAKE_KEY", ttl_days=1)
+    client = KeepaClient(cfg)
+    requested = []
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append(params["code"])
+        return DummyResp(
+            200,
+            {
+                "products": [
+                    {"asin": "B000000001", "upcList": ["012345678905"]},
+                    {"asin": "B000000002", "eanList": ["4006381333931"]},
+                ],
+                "tokensLeft": 42,
+            },
+        )
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    results = client.lookup_by_codes(
+        ["012345678905", "4006381333931", "036000291452", "012345678905"]
+    )
+
+    assert requested == ["012345678905,4006381333931,036000291452"]
+    assert list(results) == ["012345678905", "4006381333931", "036000291452"]
+    assert extract_primary_asin(results["012345678905"]["data"]) == "B000000001"
+    assert extract_primary_asin(results["4006381333931"]["data"]) == "B000000002"
+    assert results["036000291452"]["data"]["products"] == []
+    assert results["4006381333931"]["data"]["tokensLeft"] == 42
+
+    # Every code was cached individually; a fresh client reads them from SQLite
+    other = KeepaClient(cfg)
+    monkeypatch.setattr(other.session, "get", fake_get)
+    again = other.lookup_by_codes(["4006381333931", "036000291452"])
+    assert all(r["cached"] for r in again.values())
+    assert other.lookup_by_code("012345678905")["cached"]
+    assert len(requested) == 1
+
+
+def test_retry_honours_retry_after_then_jittered_backoff(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    cfg = KeepaConfig(api_key="FAKE_KEY", backoff_initial=0.5, max_retries=4)
+    client = KeepaClient(cfg)
+    throttled = DummyResp(429)
+    throttled.headers = {"Retry-After": "3"}
+    responses = iter([throttled, DummyResp(503), DummyResp(200, {"products": []})])
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params=None, timeout=None: next(responses)
+    )
+    sleeps = []
+    monkeypatch.setattr(kc.time, "sleep", sleeps.append)
+    monkeypatch.setattr(kc.random, "uniform", lambda a, b: b)
+
+    result = client.lookup_by_code("012345678905")
+
+    assert result["ok"]
+    # Retry-After wins on the 429; the 503 gets 0.5 * 2**1 plus full jitter
+    assert sleeps == [3.0, 1.5]
+
+
+def test_retry_after_is_capped_at_backoff_max(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", backoff_max=8.0))
+    throttled = DummyResp(429)
+    throttled.headers = {"Retry-After": "3600"}
+    responses = iter([throttled, DummyResp(200, {"products": []})])
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params=None, timeout=None: next(responses)
+    )
+    sleeps = []
+    monkeypatch.setattr(kc.time, "sleep", sleeps.append)
+
+    assert client.lookup_by_code("012345678905")["ok"]
+    assert sleeps == [8.0]
+
+
+def test_retry_does_not_sleep_after_last_attempt(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", max_retries=3))
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params=None, timeout=None: DummyResp(503)
+    )
+    sleeps = []
+    monkeypatch.setattr(kc.time, "sleep", sleeps.append)
+
+    result = client.lookup_by_code("012345678905")
+
+    assert result == {"ok": False, "error": "request failed after retries"}
+    assert len(sleeps) == 2
+
+
+def test_session_uses_pooled_adapter(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY"))
+    adapter = client.session.get_adapter("https://api.keepa.com/product")
+
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 0
+    assert "gzip" in client.session.headers["Accept-Encoding"]
+
+
+def test_legacy_rowid_cache_is_migrated(monkeypatch, tmp_path):
+    import sqlite3
+
+    from lotgenius import keepa_client as kc
+
+    db_path = tmp_path / "keepa_cache.sqlite"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE cache (k TEXT PRIMARY KEY, v TEXT NOT NULL, ts INTEGER NOT NULL)"
+    )
+    legacy.execute(
+        "INSERT INTO cache VALUES (?, ?, strftime('%s', 'now'))",
+        ("product:1:012345678905", json.dumps({"products": [{"asin": "B0LEGACY01"}]})),
+    )
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setattr(kc, "_DB_PATH", db_path)
+
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_days=1))
+    result = client.lookup_by_code("012345678905")
+
+    assert result["cached"]
+    assert extract_primary_asin(result["data"]) == "B0LEGACY01"
+    schema = kc._db().execute("SELECT sql FROM sqlite_master WHERE name = 'cache'")
+    assert "WITHOUT ROWID" in schema.fetchone()[0]
+
+
+def test_stale_entry_served_while_refreshing(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_sec=100))
+    old = {"products": [{"asin": "B0000000OLD"}]}
+    new = {"products": [{"asin": "B0000000NEW"}]}
+    kc._cache_set("product:1:012345678905", old)
+    # Age the row past its TTL but inside the stale window
+    conn = kc._db()
+    conn.execute("UPDATE cache SET ts = ts - 150")
+    conn.commit()
+    monkeypatch.setattr(
+        client.session,
+        "get",
+        lambda url, params=None, timeout=None: DummyResp(200, new),
+    )
+
+    stale = client.lookup_by_code("012345678905")
+    assert stale["cached"] and stale["stale"]
+    assert stale["data"] == old
+
+    client._refresh_pool.shutdown(wait=True)
+    fresh = client.lookup_by_code("012345678905")
+    assert fresh["cached"] and "stale" not in fresh
+    assert fresh["data"] == new
+
+
+def test_entry_past_stale_window_is_fetched(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_sec=100))
+    kc._cache_set("product:1:012345678905", {"products": []})
+    conn = kc._db()
+    conn.execute("UPDATE cache SET ts = ts - 250")
+    conn.commit()
+    new = {"products": [{"asin": "B0000000NEW"}]}
+    monkeypatch.setattr(
+        client.session,
+        "get",
+        lambda url, params=None, timeout=None: DummyResp(200, new),
+    )
+
+    result = client.lookup_by_code("012345678905")
+    assert not result["cached"] and result["data"] == new
+    assert client._refresh_pool is None
+
+
+def test_failed_refresh_is_logged_and_close_stops_pool(monkeypatch, tmp_path, caplog):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    kc._cache_set("product:1:012345678905", {"products": []})
+    conn = kc._db()
+    conn.execute("UPDATE cache SET ts = ts - 150")
+    conn.commit()
+
+    with KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_sec=100)) as client:
+        monkeypatch.setattr(
+            client.session,
+            "get",
+            lambda url, params=None, timeout=None: DummyResp(500),
+        )
+        with caplog.at_level(logging.DEBUG, logger=kc.logger.name):
+            assert client.lookup_by_code("012345678905")["stale"]
+            pool = client._refresh_pool
+            pool.shutdown(wait=True)
+        assert "Keepa refresh failed for product:1:012345678905" in caplog.text
+
+    assert client._refresh_pool is None
+    assert pool._shutdown
+
+
+def test_close_waits_for_queued_refreshes(monkeypatch, tmp_path):
+    import time
+
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    codes = [f"0123456789{i:02d}" for i in range(10)]
+    for code in codes:
+        kc._cache_set(f"product:1:{code}", {"products": []})
+    conn = kc._db()
+    conn.execute("UPDATE cache SET ts = ts - 150")
+    conn.commit()
+    new = {"products": [{"asin": "B0000000NEW"}]}
+
+    def slow_get(url, params=None, timeout=None):
+        time.sleep(0.01)
+        return DummyResp(200, new)
+
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_sec=100))
+    monkeypatch.setattr(client.session, "get", slow_get)
+    assert all(client.lookup_by_code(code)["stale"] for code in codes)
+    client.close(wait=True)
+
+    for code in codes:
+        assert kc._cache_get(f"product:1:{code}", 100) == new
+
+
+def test_parse_json_prefers_raw_content():
+    from lotgenius import keepa_client as kc
+
+    class RawResp(DummyResp):
+        def json(self):
+            raise AssertionError("raw content should be decoded directly")
+
+    raw = RawResp(200)
+    raw.content = b'{"products": [{"asin": "B00TESTASIN"}]}'
+    expected = {"products": [{"asin": "B00TESTASIN"}]}
+    if kc.HAS_ORJSON:
+        assert kc._parse_json(raw) == expected
+
+    # Bodies the fast path cannot decode fall back to resp.json()
+    fallback = DummyResp(200, expected)
+    fallback.content = b"\xff not json"
+    assert kc._parse_json(fallback) == expected
+    assert kc._parse_json(DummyResp(200, expected)) == expected
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("012345678905", "012345678905"),
+        (" 12345678905 ", "012345678905"),
+        ("0012345678905", "012345678905"),
+        ("4006381333931", "4006381333931"),
+        ("00012345678905", "012345678905"),
+        ("10012345678902", "10012345678902"),
+        ("B00TESTASIN", "B00TESTASIN"),
+        ("123456789", "123456789"),
+    ],
+)
+def test_normalize_code(raw, expected):
+    from lotgenius.keepa_client import _normalize_code
+
+    assert _normalize_code(raw) == expected
+
+
+def test_equivalent_codes_share_cache_entry(monkeypatch, tmp_path):
+    from lotgenius import keepa_client as kc
+
+    monkeypatch.setattr(kc, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    client = KeepaClient(KeepaConfig(api_key="FAKE_KEY", ttl_days=1))
+    requested = []
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append(params["code"])
+        return DummyResp(200, {"products": [{"asin": "B00TESTASIN"}]})
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    assert not client.lookup_by_code(" 12345678905")["cached"]
+    assert client.lookup_by_code("0012345678905")["cached"]
+    results = client.lookup_by_codes(["012345678905", "12345678905"])
+    assert all(r["cached"] for r in results.values())
+    assert requested == ["012345678905"]
@@ -1,7 +1,7 @@
 import json
 from pathlib import Path
 
-from lotgenius.keepa_extract import extract_stats_compact
+from lotgenius.keepa_extract import extract_stats_compact, extract_stats_compact_many
 
 
 def test_extract_stats_compact_with_stats():
@@ -185,3 +185,20 @@ def test_extract_stats_compact_cents_fixture():
     assert got["offers_count"] == 12
     assert got["scale_rule"] is not None
     assert "divide by 100" in got["scale_rule"]
+
+
+def test_extract_stats_compact_many_matches_single():
+    """Batch extraction yields one record per product, in response order."""
+    first = {"stats": {"buyBoxPrice": 1999, "totalOfferCount": 4}}
+    second = {"stats": {"current": [-1, 2500, -1, 42]}}
+    payload = {"data": {"products": [first, second]}}
+
+    records = extract_stats_compact_many(payload)
+
+    assert len(records) == 2
+    assert records[0] == extract_stats_compact(payload)
+    assert records[0]["price_new_median"] == 19.99
+    assert records[0]["offers_count"] == 4
+    assert records[1]["price_new_median"] == 25.0
+    assert records[1]["salesrank_median"] == 42
+    assert extract_stats_compact_many({}) == []
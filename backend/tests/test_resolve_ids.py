@@ -38,6 +38,7 @@ def _fake_client_init(self, cfg=None):
         }
 
     self.lookup_by_code = fake_lookup_by_code
+    self.close = lambda wait=False: None
 
 
 def test_resolve_ids_upc_to_asin(monkeypatch):
@@ -137,25 +138,32 @@ def test_cli_gzip_ledger(monkeypatch, tmp_path):
         def json(self):
             return self._payload
 
-    def fake_init(self, cfg=None):
-        self.cfg = cfg or type(
-            "C",
-            (),
-            {
-                "api_key": "FAKE",  # pragma: allowlist secret
-                "domain": 1,
-                "timeout_sec": 5,
-                "ttl_days": 7,
-                "backoff_initial": 0.1,
-                "backoff_max": 1.0,
-                "max_retries": 1,
-            },
-        )
+    from lotgenius import keepa_client
+    from lotgenius.keepa_client import KeepaClient, KeepaConfig
+
+    monkeypatch.setattr(keepa_client, "_DB_PATH", tmp_path / "keepa_cache.sqlite")
+    real_init = KeepaClient.__init__
 
-        class Sess:
-            def get(self, url, params=None, timeout=None):
-                return DummyResp()
+    class Sess:
+        def get(self, url, params=None, timeout=None):
+            return DummyResp()
 
+        def close(self):
+            pass
+
+    def fake_init(self, cfg=None):
+        # Real client state (memory cache, refresh pool) with a canned session
+        real_init(
+            self,
+            cfg
+            or KeepaConfig(
+                api_key="FAKE",  # pragma: allowlist secret
+                timeout_sec=5,
+                backoff_initial=0.1,
+                backoff_max=1.0,
+                max_retries=1,
+            ),
+        )
         self.session = Sess()
 
     monkeypatch.setattr("lotgenius.keepa_client.KeepaClient.__init__", fake_init)
@@ -189,3 +197,32 @@ def test_cli_gzip_ledger(monkeypatch, tmp_path):
     with gzip.open(gz_path, "rt", encoding="utf-8") as f:
         line = f.readline()
     json.loads(line)  # should parse
+
+
+def test_ledger_line_same_with_and_without_orjson(monkeypatch, tmp_path):
+    import numpy as np
+    from lotgenius import resolve
+    from lotgenius.resolve import EvidenceRecord, write_ledger_jsonl
+
+    record = EvidenceRecord(
+        row_index=0,
+        sku_local="SKU-1",
+        upc_ean_asin=None,
+        source="keepa:code",
+        ok=True,
+        match_asin=None,
+        cached=None,
+        meta={"price": float("nan"), "rank": np.int64(42), "score": np.float64(0.5)},
+        timestamp="2024-01-01T00:00:00+00:00",
+    )
+
+    fast = None
+    if resolve.HAS_ORJSON:
+        fast = write_ledger_jsonl([record], tmp_path / "orjson.jsonl").read_bytes()
+
+    monkeypatch.setattr(resolve, "HAS_ORJSON", False)
+    fallback = write_ledger_jsonl([record], tmp_path / "stdlib.jsonl").read_bytes()
+    line = json.loads(fallback)
+    assert line["meta"] == {"price": None, "rank": 42, "score": 0.5}
+    if fast is not None:
+        assert fallback == fast
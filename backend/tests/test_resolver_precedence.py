@@ -97,6 +97,7 @@ class TestResolverPrecedence:
 
         # Assert Keepa was called with the explicit UPC (not the canonical EAN)
         mock_client.lookup_by_code.assert_called_once_with("012345678905")
+        mock_client.close.assert_called_once_with(wait=True)
 
         # Assert ledger metadata
         assert len(ledger) == 1